@@ -5,6 +5,12 @@ from pathlib import Path
 from typing import List
 import yaml
 
+# Prefer the libyaml-backed C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
 
 @dataclass
 class Config:
@@ -170,7 +176,7 @@ class ConfigManager:
         
         # Load configuration from file
         with open(config_path, 'r') as f:
-            config_dict = yaml.safe_load(f)
+            config_dict = yaml.load(f, Loader=YamlLoader)
         
         # Merge with defaults for any missing keys
         default_config = ConfigManager.get_default_config()
@@ -245,4 +251,4 @@ class ConfigManager:
         
         # Write configuration file
         with open(config_path, 'w') as f:
-            yaml.dump(config_dict, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(config_dict, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
@@ -1,8 +1,12 @@
 """Frame extraction components for Video Frame Stitcher."""
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Callable, Optional
+from typing import List, Callable, Optional, Set
+import os
+import sys
 import cv2
 import numpy as np
 import logging
@@ -25,9 +29,17 @@ class ExtractedFrame:
         camera_id: Camera identifier ('cam0' or 'cam1')
         file_path: Path to the extracted frame image file
     """
+    # Slots instead of a per-instance __dict__; many of these are created per
+    # run. (dataclass(slots=True) needs Python 3.10.)
+    __slots__ = ('global_frame_number', 'camera_id', 'file_path')
+    
     global_frame_number: int
     camera_id: str
     file_path: Path
+    
+    def __post_init__(self):
+        # Every frame of a camera shares the same interned id string
+        self.camera_id = sys.intern(self.camera_id)
 
 
 class FrameExtractor:
@@ -42,6 +54,11 @@ class FrameExtractor:
         output_format: Image format for saved frames ('png' or 'jpg')
     """
     
+    # Background threads used to save frames during extract_frames, and the
+    # maximum number of decoded frames waiting to be saved
+    _SAVE_WORKERS = 2
+    _MAX_PENDING_SAVES = 8
+    
     def __init__(self, sampling_interval: int, output_format: str, 
                  enable_overlay: bool = True, overlay_font_size: int = 32, 
                  overlay_position: str = "top-left"):
@@ -70,6 +87,14 @@ class FrameExtractor:
         self.enable_overlay = enable_overlay
         self.overlay_font_size = overlay_font_size
         self.overlay_position = overlay_position
+        
+        # PNG is lossless at any level; level 1 is much faster than OpenCV's
+        # default of 3 for a small size cost
+        self._imwrite_params = [cv2.IMWRITE_PNG_COMPRESSION, 1] if normalized_format == 'png' else []
+        
+        # Output directories already created by save_frame, so each is only
+        # mkdir'ed once rather than once per frame
+        self._ensured_dirs: Set[Path] = set()
     
     def _open_video(self, video_path: Path):
         """Open a video file and return the capture object.
@@ -81,11 +106,15 @@ class FrameExtractor:
             cv2.VideoCapture object or None if failed to open
         """
         try:
-            cap = cv2.VideoCapture(str(video_path))
+            cap = cv2.VideoCapture(os.fspath(video_path))
             
             if not cap.isOpened():
                 logger.error(f"Unable to open video file: {video_path}")
+                cap.release()
                 return None
+            # Frames are consumed strictly in order, so any read-ahead a
+            # backend offers is wasted (backends without it ignore this)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             return cap
         except Exception as e:
             logger.error(f"Error opening video {video_path}: {e}")
@@ -103,12 +132,25 @@ class FrameExtractor:
         Returns:
             True if the frame should be extracted, False otherwise
         """
-        if global_frame_number < 1:
-            return False
-        
         # Extract frame if it's at position 1, 1+N, 1+2N, etc.
-        # This is equivalent to: (global_frame_number - 1) % sampling_interval == 0
-        return (global_frame_number - 1) % self.sampling_interval == 0
+        return global_frame_number >= 1 and (global_frame_number - 1) % self.sampling_interval == 0
+    
+    @staticmethod
+    def _should_extract_every_frame(global_frame_number: int) -> bool:
+        """should_extract_frame specialized for a sampling interval of 1."""
+        return global_frame_number >= 1
+    
+    def extract_mask(self, total_frames: int) -> np.ndarray:
+        """Vectorized should_extract_frame for global frames 1..total_frames.
+        
+        Args:
+            total_frames: Number of frames to evaluate
+            
+        Returns:
+            Boolean array where element i is True if global frame i + 1
+            should be extracted
+        """
+        return np.arange(total_frames) % self.sampling_interval == 0
     
     def add_frame_number_overlay(self, frame: np.ndarray, frame_number: int) -> np.ndarray:
         """Add frame number overlay to the frame image.
@@ -200,15 +242,17 @@ class FrameExtractor:
         frame_to_save = self.add_frame_number_overlay(frame, global_frame_number)
         
         # Ensure output directory exists
-        output_dir.mkdir(parents=True, exist_ok=True)
+        if output_dir not in self._ensured_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(output_dir)
         
         # Format filename with zero-padding (minimum 4 digits)
-        filename = f"frame_{global_frame_number:04d}.{self.output_format}"
+        filename = "frame_%04d.%s" % (global_frame_number, self.output_format)
         file_path = output_dir / filename
         
         # Save the frame
         try:
-            success = cv2.imwrite(str(file_path), frame_to_save)
+            success = cv2.imwrite(os.fspath(file_path), frame_to_save, self._imwrite_params)
             if not success:
                 raise IOError(f"cv2.imwrite returned False for {file_path}")
         except Exception as e:
@@ -254,73 +298,110 @@ class FrameExtractor:
         global_frame_number = 0
         total_frames = sum(seg.frame_count for seg in video_segments)
         
-        # Process each video segment in order
-        for segment in video_segments:
+        # Frames are saved on a small thread pool so that decoding overlaps
+        # with encoding (cv2 releases the GIL while writing). Pending saves
+        # are collected in submission order, which keeps the results and
+        # progress reports ordered by frame number.
+        pending = deque()
+        
+        def collect_oldest():
+            # Errors are attributed to the frame the save belongs to, not to
+            # the frame being decoded when it is collected
+            frame_number, source_path, future = pending.popleft()
             try:
-                # Open the video file
-                cap = cv2.VideoCapture(str(segment.file_path))
-                if not cap.isOpened():
+                file_path = future.result()
+                
+                extracted_frames.append(ExtractedFrame(
+                    global_frame_number=frame_number,
+                    camera_id=camera_id,
+                    file_path=file_path
+                ))
+                
+                # Report progress if callback provided
+                if progress_callback:
+                    progress_callback(len(extracted_frames), total_frames)
+            
+            except Exception as e:
+                # Log error and continue with next frame
+                log_error(FrameExtractionError(frame_number, source_path, str(e)))
+        
+        # With an interval of 1 every frame is extracted; skip the modulo
+        if self.sampling_interval == 1:
+            should_extract = self._should_extract_every_frame
+        else:
+            should_extract = self.should_extract_frame
+        
+        with ThreadPoolExecutor(max_workers=self._SAVE_WORKERS) as save_pool:
+            # Process each video segment in order
+            for segment in video_segments:
+                cap = None
+                try:
+                    # Open the video file
+                    cap = self._open_video(segment.file_path)
+                    if cap is None:
+                        # Log error and skip this segment
+                        error = VideoFileError(
+                            segment.file_path,
+                            "open",
+                            "Video file cannot be opened or is corrupted"
+                        )
+                        log_error(error, f"Segment {segment.segment_number}")
+                        global_frame_number += segment.frame_count
+                        continue
+                    
+                    # Process each frame in the segment. grab() only advances the
+                    # stream; frames are decoded with retrieve() only when sampled.
+                    local_frame_number = 0
+                    while cap.grab():
+                        local_frame_number += 1
+                        global_frame_number += 1
+                        
+                        # Check if this frame should be extracted
+                        if should_extract(global_frame_number):
+                            try:
+                                ret, frame = cap.retrieve()
+                                if not ret:
+                                    raise IOError("Frame could not be decoded")
+                                
+                                # Queue the frame for saving
+                                future = save_pool.submit(self.save_frame, frame,
+                                                          global_frame_number, output_dir,
+                                                          camera_id)
+                            
+                            except Exception as e:
+                                # Log error and continue with next frame
+                                error = FrameExtractionError(
+                                    global_frame_number,
+                                    segment.file_path,
+                                    str(e)
+                                )
+                                log_error(error)
+                                continue
+                            
+                            # Collect finished saves, bounding the number of
+                            # decoded frames held in memory
+                            pending.append((global_frame_number, segment.file_path, future))
+                            while len(pending) > self._MAX_PENDING_SAVES or \
+                                    (pending and pending[0][2].done()):
+                                collect_oldest()
+                
+                except Exception as e:
                     # Log error and skip this segment
                     error = VideoFileError(
                         segment.file_path,
-                        "open",
-                        "Video file cannot be opened or is corrupted"
+                        "process",
+                        str(e)
                     )
                     log_error(error, f"Segment {segment.segment_number}")
                     global_frame_number += segment.frame_count
                     continue
                 
-                # Process each frame in the segment
-                local_frame_number = 0
-                while True:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-                    
-                    local_frame_number += 1
-                    global_frame_number += 1
-                    
-                    # Check if this frame should be extracted
-                    if self.should_extract_frame(global_frame_number):
-                        try:
-                            # Save the frame
-                            file_path = self.save_frame(frame, global_frame_number, 
-                                                       output_dir, camera_id)
-                            
-                            # Create metadata
-                            extracted_frame = ExtractedFrame(
-                                global_frame_number=global_frame_number,
-                                camera_id=camera_id,
-                                file_path=file_path
-                            )
-                            extracted_frames.append(extracted_frame)
-                            
-                            # Report progress if callback provided
-                            if progress_callback:
-                                progress_callback(len(extracted_frames), total_frames)
-                        
-                        except Exception as e:
-                            # Log error and continue with next frame
-                            error = FrameExtractionError(
-                                global_frame_number,
-                                segment.file_path,
-                                str(e)
-                            )
-                            log_error(error)
-                            continue
-                
-                # Release the video capture
-                cap.release()
-            
-            except Exception as e:
-                # Log error and skip this segment
-                error = VideoFileError(
-                    segment.file_path,
-                    "process",
-                    str(e)
-                )
-                log_error(error, f"Segment {segment.segment_number}")
-                global_frame_number += segment.frame_count
-                continue
+                finally:
+                    # Release the video capture on every path, including errors
+                    if cap is not None:
+                        cap.release()
+
+            while pending:
+                collect_oldest()
         
         return extracted_frames
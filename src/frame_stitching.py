@@ -1,13 +1,22 @@
 """Frame stitching module for vertically combining stereo camera frames."""
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Tuple, Callable, Optional
 from PIL import Image, ImageDraw, ImageFont
 import logging
+import os
 import cv2
 import numpy as np
 
+# libvips joins frames in a single streaming pass without building the full
+# stitched canvas in Python; PIL is used when it is not installed
+try:
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
 from src.frame_extraction import ExtractedFrame
 from src.error_handling import (
     StitchingError, OutputDirectoryError,
@@ -73,12 +82,15 @@ class FrameStitcher:
         cam0_map = {frame.global_frame_number: frame for frame in cam0_frames}
         cam1_map = {frame.global_frame_number: frame for frame in cam1_frames}
         
-        # Find intersection of frame numbers
-        common_frame_numbers = sorted(set(cam0_map.keys()) & set(cam1_map.keys()))
+        # Find intersection of frame numbers (dict key views support set
+        # operations directly, so no intermediate sets are built)
+        cam0_keys = cam0_map.keys()
+        cam1_keys = cam1_map.keys()
+        common_frame_numbers = sorted(cam0_keys & cam1_keys)
         
         # Log warnings for unpaired frames
-        cam0_only = set(cam0_map.keys()) - set(cam1_map.keys())
-        cam1_only = set(cam1_map.keys()) - set(cam0_map.keys())
+        cam0_only = cam0_keys - cam1_keys
+        cam1_only = cam1_keys - cam0_keys
         
         if cam0_only:
             logger.warning(f"Found {len(cam0_only)} frames in cam0 without matching cam1 frames")
@@ -202,31 +214,19 @@ class FrameStitcher:
         Raises:
             StitchingError: If frames cannot be loaded or stitched
         """
+        # The overlay is drawn on the PIL image, so libvips only handles
+        # stitchers that save frames as-is
+        if pyvips is not None and not self.enable_overlay:
+            self._stitch_pair_vips(cam0_path, cam1_path, output_path)
+            return
+        
         try:
             # Load images
             cam0_img = Image.open(cam0_path)
             cam1_img = Image.open(cam1_path)
             
-            # Get dimensions
-            cam0_width, cam0_height = cam0_img.size
-            cam1_width, cam1_height = cam1_img.size
-            
-            # Determine output width (maximum of the two)
-            output_width = max(cam0_width, cam1_width)
-            output_height = cam0_height + cam1_height
-            
-            # Create output image with white background
-            stitched = Image.new('RGB', (output_width, output_height), color='white')
-            
-            # Calculate horizontal offsets for centering
-            cam0_x_offset = (output_width - cam0_width) // 2
-            cam1_x_offset = (output_width - cam1_width) // 2
-            
-            # Paste cam0 on top
-            stitched.paste(cam0_img, (cam0_x_offset, 0))
-            
-            # Paste cam1 on bottom
-            stitched.paste(cam1_img, (cam1_x_offset, cam0_height))
+            # Compose the stitched frame
+            stitched = self.stitch_pair_to_image(cam0_img, cam1_img)
             
             # Apply frame number overlay if enabled
             if self.enable_overlay and frame_number > 0:
@@ -236,7 +236,9 @@ class FrameStitcher:
             if self.output_format == 'jpg' or self.output_format == 'jpeg':
                 stitched.save(output_path, 'JPEG', quality=95)
             else:
-                stitched.save(output_path, 'PNG')
+                # PNG is lossless at any level; level 1 matches the extractor
+                # and is much faster than PIL's default of 6
+                stitched.save(output_path, 'PNG', compress_level=1)
             
             # Close images to free memory
             cam0_img.close()
@@ -265,6 +267,124 @@ class FrameStitcher:
                 f"Unexpected error: {e}"
             )
     
+    def stitch_pair_to_image(self, cam0_img: Image.Image, cam1_img: Image.Image) -> Image.Image:
+        """Stack two decoded frames vertically (cam0 on top, cam1 on bottom).
+        
+        In-memory counterpart of stitch_pair, which uses it for the layout:
+        the narrower frame is centered on a white background. No frame
+        number overlay is applied and nothing is written to disk.
+        
+        Args:
+            cam0_img: Decoded cam0 frame
+            cam1_img: Decoded cam1 frame
+        
+        Returns:
+            New RGB image holding both frames
+        """
+        # Decode both frames to RGB arrays; paste would do the same conversion
+        cam0_arr = np.asarray(cam0_img if cam0_img.mode == 'RGB' else cam0_img.convert('RGB'))
+        cam1_arr = np.asarray(cam1_img if cam1_img.mode == 'RGB' else cam1_img.convert('RGB'))
+        
+        # Get dimensions
+        cam0_height, cam0_width = cam0_arr.shape[:2]
+        cam1_height, cam1_width = cam1_arr.shape[:2]
+        
+        # Determine output width (maximum of the two)
+        output_width = max(cam0_width, cam1_width)
+        output_height = cam0_height + cam1_height
+        
+        # Calculate horizontal offsets for centering
+        cam0_x_offset = (output_width - cam0_width) // 2
+        cam1_x_offset = (output_width - cam1_width) // 2
+        
+        # One white canvas allocation, then a slice copy per frame
+        out = np.full((output_height, output_width, 3), 255, dtype=np.uint8)
+        out[:cam0_height, cam0_x_offset:cam0_x_offset + cam0_width] = cam0_arr
+        out[cam0_height:, cam1_x_offset:cam1_x_offset + cam1_width] = cam1_arr
+        
+        stitched = Image.fromarray(out, 'RGB')
+        
+        return stitched
+    
+    def _stitch_pair_vips(self, cam0_path: Path, cam1_path: Path, output_path: Path) -> None:
+        """Stitch two frames vertically with libvips.
+        
+        Produces the same layout as the PIL path in stitch_pair: cam0 on top,
+        the narrower frame centered on a white background.
+        
+        Args:
+            cam0_path: Path to cam0 frame image
+            cam1_path: Path to cam1 frame image
+            output_path: Path where stitched image should be saved
+            
+        Raises:
+            StitchingError: If frames cannot be loaded or stitched
+        """
+        try:
+            # Normalise both frames to 8-bit 3-band sRGB, like the PIL path's
+            # convert('RGB'): greyscale is expanded and alpha is dropped
+            cam0_img, cam1_img = (
+                self._vips_to_rgb(pyvips.Image.new_from_file(str(path), access="sequential"))
+                for path in (cam0_path, cam1_path)
+            )
+            
+            # Center each frame on the output width with the same rounding
+            # as the PIL path, then stack them
+            output_width = max(cam0_img.width, cam1_img.width)
+            cam0_img, cam1_img = (
+                img.embed((output_width - img.width) // 2, 0, output_width, img.height,
+                          extend="background", background=[255, 255, 255])
+                for img in (cam0_img, cam1_img)
+            )
+            stitched = cam0_img.join(cam1_img, "vertical")
+            
+            # Encode by output_format, as the PIL path does, rather than
+            # letting libvips pick a saver from the file extension
+            if self.output_format == 'jpg' or self.output_format == 'jpeg':
+                stitched.jpegsave(str(output_path), Q=95)
+            else:
+                stitched.pngsave(str(output_path), compression=1)
+        
+        except FileNotFoundError as e:
+            raise StitchingError(
+                0,
+                cam0_path,
+                cam1_path,
+                f"Image file not found: {e}"
+            )
+        except (pyvips.Error, IOError) as e:
+            raise StitchingError(
+                0,
+                cam0_path,
+                cam1_path,
+                f"Failed to read or write image: {e}"
+            )
+        except Exception as e:
+            raise StitchingError(
+                0,
+                cam0_path,
+                cam1_path,
+                f"Unexpected error: {e}"
+            )
+    
+    @staticmethod
+    def _vips_to_rgb(img: "pyvips.Image") -> "pyvips.Image":
+        """Convert a libvips image to 8-bit, 3-band sRGB without alpha.
+        
+        Args:
+            img: Image as loaded by libvips
+        
+        Returns:
+            Image with exactly three uchar bands
+        """
+        if img.hasalpha():
+            img = img.extract_band(0, n=img.bands - 1)
+        if img.format != 'uchar':
+            img = img.cast('uchar')
+        if img.bands == 1:
+            img = img.bandjoin([img, img])
+        return img.copy(interpretation='srgb')
+    
     def stitch_frames(
         self,
         cam0_frames: List[ExtractedFrame],
@@ -301,40 +421,54 @@ class FrameStitcher:
         stitched_frames = []
         total_pairs = len(frame_pairs)
         
-        for idx, (cam0_frame, cam1_frame) in enumerate(frame_pairs):
-            # Generate output filename
-            frame_num = cam0_frame.global_frame_number
-            filename = f"frame_{frame_num:04d}.{self.output_format}"
-            output_path = output_dir / filename
-            
-            try:
-                # Stitch the pair
-                self.stitch_pair(cam0_frame.file_path, cam1_frame.file_path, output_path, frame_num)
+        # Stitching is dominated by image decode/encode in C code that releases
+        # the GIL, so pairs are stitched concurrently. Results are collected in
+        # pair order to keep the output list and progress reports ordered.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = []
+            for cam0_frame, cam1_frame in frame_pairs:
+                # Generate output filename
+                frame_num = cam0_frame.global_frame_number
+                filename = f"frame_{frame_num:04d}.{self.output_format}"
+                output_path = output_dir / filename
                 
-                # Record stitched frame
-                stitched_frames.append(StitchedFrame(
-                    global_frame_number=frame_num,
-                    file_path=output_path
-                ))
-                
-                # Report progress
-                if progress_callback:
-                    progress_callback(idx + 1, total_pairs)
+                # Stitch the pair
+                futures.append((output_path, executor.submit(
+                    self.stitch_pair, cam0_frame.file_path, cam1_frame.file_path,
+                    output_path, frame_num
+                )))
+            
+            for idx, ((cam0_frame, cam1_frame), (output_path, future)) in enumerate(
+                zip(frame_pairs, futures)
+            ):
+                frame_num = cam0_frame.global_frame_number
+                try:
+                    future.result()
+                    
+                    # Record stitched frame
+                    stitched_frames.append(StitchedFrame(
+                        global_frame_number=frame_num,
+                        file_path=output_path
+                    ))
                     
-            except StitchingError as e:
-                # Update frame number in error
-                e.frame_number = frame_num
-                log_error(e)
-                continue
-            except Exception as e:
-                error = StitchingError(
-                    frame_num,
-                    cam0_frame.file_path,
-                    cam1_frame.file_path,
-                    str(e)
-                )
-                log_error(error)
-                continue
+                    # Report progress
+                    if progress_callback:
+                        progress_callback(idx + 1, total_pairs)
+                        
+                except StitchingError as e:
+                    # Update frame number in error
+                    e.frame_number = frame_num
+                    log_error(e)
+                    continue
+                except Exception as e:
+                    error = StitchingError(
+                        frame_num,
+                        cam0_frame.file_path,
+                        cam1_frame.file_path,
+                        str(e)
+                    )
+                    log_error(error)
+                    continue
         
         logger.info(f"Successfully stitched {len(stitched_frames)} frames")
         
@@ -5,14 +5,14 @@ import logging
 import argparse
 import signal
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 from datetime import datetime
 from queue import Queue
 from tqdm import tqdm
 
-from src.config import ConfigManager
+from src.config import Config, ConfigManager
 from src.video_discovery import VideoDiscovery
 from src.frame_extraction import FrameExtractor
 from src.frame_stitching import FrameStitcher
@@ -84,6 +84,7 @@ def streaming_extraction_worker(
         frames = []
         
         for segment in segments:
+            cap = None
             try:
                 cap = extractor._open_video(segment.file_path)
                 if cap is None:
@@ -92,16 +93,17 @@ def streaming_extraction_worker(
                 global_frame_number = sum(s.frame_count for s in segments[:segments.index(segment)])
                 local_frame_number = 0
                 
-                while True:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-                    
+                # Only sampled frames are decoded; the rest are just grabbed
+                while cap.grab():
                     local_frame_number += 1
                     global_frame_number += 1
                     
                     if extractor.should_extract_frame(global_frame_number):
                         try:
+                            ret, frame = cap.retrieve()
+                            if not ret:
+                                raise IOError("Frame could not be decoded")
+                            
                             file_path = extractor.save_frame(
                                 frame, global_frame_number, output_dir, camera_id
                             )
@@ -134,11 +136,14 @@ def streaming_extraction_worker(
                             logger.error(f"Error saving frame {global_frame_number} from {camera_id}: {e}")
                             continue
                 
-                cap.release()
-                
             except Exception as e:
                 logger.error(f"Error processing segment {segment.file_path}: {e}")
                 continue
+            
+            finally:
+                # Release the video capture on every path, including errors
+                if cap is not None:
+                    cap.release()
         
         return frames
         
@@ -198,11 +203,12 @@ def streaming_stitcher_worker(
     return stitched_count
 
 
-def main(config_path: Optional[Path] = None) -> int:
+def main(config_or_path: Optional[Union[Path, Config]] = None) -> int:
     """Main application function with streaming pipeline.
     
     Args:
-        config_path: Optional path to configuration file
+        config_or_path: Config to run with directly, or path to a
+            configuration file to load (defaults to config.yaml)
         
     Returns:
         Exit code: 0 for success, non-zero for failure
@@ -215,12 +221,14 @@ def main(config_path: Optional[Path] = None) -> int:
     
     try:
         # Load configuration
-        if config_path is None:
-            config_path = Path('config.yaml')
-        
-        logger.info("Loading configuration...")
-        config_manager = ConfigManager()
-        config = config_manager.load_config(config_path)
+        if isinstance(config_or_path, Config):
+            config = config_or_path
+        else:
+            config_path = config_or_path if config_or_path is not None else Path('config.yaml')
+            
+            logger.info("Loading configuration...")
+            config_manager = ConfigManager()
+            config = config_manager.load_config(config_path)
         
         logger.info(f"Configuration loaded:")
         logger.info(f"  Input directory: {config.input_dir}")
@@ -309,8 +317,8 @@ def main(config_path: Optional[Path] = None) -> int:
         )
         
         # Calculate expected frame counts
-        expected_cam0 = sum(1 for i in range(1, cam0_total + 1) if extractor.should_extract_frame(i))
-        expected_cam1 = sum(1 for i in range(1, cam1_total + 1) if extractor.should_extract_frame(i))
+        expected_cam0 = int(extractor.extract_mask(cam0_total).sum())
+        expected_cam1 = int(extractor.extract_mask(cam1_total).sum())
         expected_stitched = min(expected_cam0, expected_cam1)
         
         logger.info(f"Expected to extract: cam0={expected_cam0}, cam1={expected_cam1}")
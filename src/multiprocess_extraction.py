@@ -56,17 +56,18 @@ def extract_segment_frames(task: SegmentExtractionTask) -> List[Dict]:
         extracted_frames = []
         local_frame_number = 0
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
+        # Only sampled frames are decoded; the rest are just grabbed
+        while cap.grab():
             local_frame_number += 1
             global_frame_number = task.global_frame_offset + local_frame_number
             
             # Check if this frame should be extracted
             if extractor.should_extract_frame(global_frame_number):
                 try:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        raise IOError("Frame could not be decoded")
+                    
                     # Save the frame
                     file_path = extractor.save_frame(
                         frame, global_frame_number, 
@@ -237,16 +237,16 @@ Camera 1 (cam1):
   - 评级 (Rating): {'✅ 优秀 (Excellent)' if abs(sync_analysis.start_delay_ms) < 10 else '✅ 良好 (Good)' if abs(sync_analysis.start_delay_ms) < 50 else '⚠️ 一般 (Fair)'}
 
 2.4 时间戳对齐分析:
-  - 采样点数 (Sample Points): {len(sync_analysis.sample_drifts)}
+  - 采样点数 (Sample Points): {len(sync_analysis.sample_indices)}
   - 平均时间偏差 (Avg Drift): {sync_analysis.avg_time_drift_ms:.2f}ms
   - 最大时间偏差 (Max Drift): {sync_analysis.max_time_drift_ms:.2f}ms
   - 标准差 (Std Dev): {sync_analysis.time_drift_std_ms:.2f}ms
   
   偏差分布 (Drift Distribution):
-    <10ms:   {sync_analysis.drift_distribution['<10ms']:3d}帧 ({sync_analysis.drift_distribution['<10ms']/len(sync_analysis.sample_drifts)*100:5.1f}%) {'✅' if sync_analysis.drift_distribution['<10ms']/len(sync_analysis.sample_drifts) > 0.5 else '⚠️'}
-    10-30ms: {sync_analysis.drift_distribution['10-30ms']:3d}帧 ({sync_analysis.drift_distribution['10-30ms']/len(sync_analysis.sample_drifts)*100:5.1f}%) ⚠️
-    30-50ms: {sync_analysis.drift_distribution['30-50ms']:3d}帧 ({sync_analysis.drift_distribution['30-50ms']/len(sync_analysis.sample_drifts)*100:5.1f}%) ⚠️
-    >50ms:   {sync_analysis.drift_distribution['>50ms']:3d}帧 ({sync_analysis.drift_distribution['>50ms']/len(sync_analysis.sample_drifts)*100:5.1f}%) {'❌' if sync_analysis.drift_distribution['>50ms'] > 0 else '✅'}
+    <10ms:   {sync_analysis.drift_distribution['<10ms']:3d}帧 ({sync_analysis.drift_distribution['<10ms']/len(sync_analysis.sample_indices)*100:5.1f}%) {'✅' if sync_analysis.drift_distribution['<10ms']/len(sync_analysis.sample_indices) > 0.5 else '⚠️'}
+    10-30ms: {sync_analysis.drift_distribution['10-30ms']:3d}帧 ({sync_analysis.drift_distribution['10-30ms']/len(sync_analysis.sample_indices)*100:5.1f}%) ⚠️
+    30-50ms: {sync_analysis.drift_distribution['30-50ms']:3d}帧 ({sync_analysis.drift_distribution['30-50ms']/len(sync_analysis.sample_indices)*100:5.1f}%) ⚠️
+    >50ms:   {sync_analysis.drift_distribution['>50ms']:3d}帧 ({sync_analysis.drift_distribution['>50ms']/len(sync_analysis.sample_indices)*100:5.1f}%) {'❌' if sync_analysis.drift_distribution['>50ms'] > 0 else '✅'}
   
   采样点详细对比 (Sample Point Details):
     {'帧索引':>8s}  {'Cam0时间':>10s}  {'Cam1时间':>10s}  {'时间差':>10s}  状态
@@ -258,9 +258,9 @@ Camera 1 (cam1):
             report_content += f"""
     {idx:8d}  {cam0_time:10.3f}s  {cam1_time:10.3f}s  {drift:+9.2f}ms  {status}"""
         
-        if len(sync_analysis.sample_drifts) > 10:
+        if len(sync_analysis.sample_indices) > 10:
             report_content += f"""
-    ... (显示前10个采样点，共{len(sync_analysis.sample_drifts)}个)"""
+    ... (显示前10个采样点，共{len(sync_analysis.sample_indices)}个)"""
         
         report_content += f"""
   
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 import statistics
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -37,9 +38,30 @@ class SyncAnalysis:
     max_time_drift_ms: float
     time_drift_std_ms: float
     drift_distribution: Dict[str, int]  # <10ms, 10-30ms, 30-50ms, >50ms
-    sample_drifts: List[Tuple[int, float, float, float]]  # (frame_idx, cam0_time, cam1_time, drift)
+    sample_indices: List[int]
+    sample_cam0_us: List[int]
+    sample_cam1_us: List[int]
+    sample_drift_ms: List[float]
     overall_rating: str
     recommendations: List[str]
+    
+    @cached_property
+    def sample_drifts(self) -> List[Tuple[int, float, float, float]]:
+        """Sample points as (frame_idx, cam0_time_s, cam1_time_s, drift_ms) tuples.
+        
+        Times are relative to each camera's first frame. Built on first access,
+        since only the detailed report needs them.
+        """
+        cam0_origin_us = self.cam0_stats.start_time_us
+        cam1_origin_us = self.cam1_stats.start_time_us
+        return [
+            (idx, (cam0_us - cam0_origin_us) / 1_000_000,
+             (cam1_us - cam1_origin_us) / 1_000_000, drift_ms)
+            for idx, cam0_us, cam1_us, drift_ms in zip(
+                self.sample_indices, self.sample_cam0_us,
+                self.sample_cam1_us, self.sample_drift_ms
+            )
+        ]
 
 
 class TimestampAnalyzer:
@@ -128,7 +150,7 @@ class TimestampAnalyzer:
         self, 
         cam0_timestamps: List[Dict], 
         cam1_timestamps: List[Dict]
-    ) -> Tuple[float, float, float, Dict[str, int], List[Tuple[int, float, float, float]]]:
+    ) -> Tuple[float, float, float, Dict[str, int], Tuple[List[int], List[int], List[int], List[float]]]:
         """Analyze time drift between two cameras.
         
         Args:
@@ -136,7 +158,9 @@ class TimestampAnalyzer:
             cam1_timestamps: Timestamps from camera 1
             
         Returns:
-            Tuple of (avg_drift_ms, max_drift_ms, std_drift_ms, distribution, sample_drifts)
+            Tuple of (avg_drift_ms, max_drift_ms, std_drift_ms, distribution, samples),
+            where samples is (sample_indices, cam0_us, cam1_us, drift_ms) with raw
+            microsecond timestamps for each sample point
         """
         min_frames = min(len(cam0_timestamps), len(cam1_timestamps))
         
@@ -148,19 +172,15 @@ class TimestampAnalyzer:
             sample_indices = [i * step for i in range(self.sample_points)]
         
         drifts = []
-        sample_drifts = []
-        
-        for idx in sample_indices:
-            cam0_time_us = cam0_timestamps[idx]['pts_us']
-            cam1_time_us = cam1_timestamps[idx]['pts_us']
-            drift_us = cam0_time_us - cam1_time_us
-            drift_ms = drift_us / 1000
+        # Raw samples for the detailed report; SyncAnalysis formats them lazily
+        cam0_samples_us = [cam0_timestamps[idx]['pts_us'] for idx in sample_indices]
+        cam1_samples_us = [cam1_timestamps[idx]['pts_us'] for idx in sample_indices]
+        drift_samples_ms = []
+        
+        for cam0_time_us, cam1_time_us in zip(cam0_samples_us, cam1_samples_us):
+            drift_ms = (cam0_time_us - cam1_time_us) / 1000
+            drift_samples_ms.append(drift_ms)
             drifts.append(abs(drift_ms))
-            
-            # Store sample for detailed report
-            cam0_time_s = (cam0_time_us - cam0_timestamps[0]['pts_us']) / 1_000_000
-            cam1_time_s = (cam1_time_us - cam1_timestamps[0]['pts_us']) / 1_000_000
-            sample_drifts.append((idx, cam0_time_s, cam1_time_s, drift_ms))
         
         avg_drift_ms = statistics.mean(drifts)
         max_drift_ms = max(drifts)
@@ -174,7 +194,8 @@ class TimestampAnalyzer:
             '>50ms': sum(1 for d in drifts if d >= 50)
         }
         
-        return avg_drift_ms, max_drift_ms, std_drift_ms, distribution, sample_drifts
+        samples = (sample_indices, cam0_samples_us, cam1_samples_us, drift_samples_ms)
+        return avg_drift_ms, max_drift_ms, std_drift_ms, distribution, samples
     
     def analyze_sync_quality(
         self, 
@@ -202,13 +223,14 @@ class TimestampAnalyzer:
         duration_diff_seconds = cam0_stats.duration_seconds - cam1_stats.duration_seconds
         
         # Analyze time drift
-        avg_drift, max_drift, std_drift, distribution, sample_drifts = self.analyze_time_drift(
+        avg_drift, max_drift, std_drift, distribution, samples = self.analyze_time_drift(
             cam0_timestamps, cam1_timestamps
         )
+        sample_indices, cam0_samples_us, cam1_samples_us, drift_samples_ms = samples
         
         # Determine overall rating
         rating, recommendations = self._calculate_rating(
-            start_delay_ms, avg_drift, max_drift, distribution, len(sample_drifts)
+            start_delay_ms, avg_drift, max_drift, distribution, len(sample_indices)
         )
         
         return SyncAnalysis(
@@ -220,7 +242,10 @@ class TimestampAnalyzer:
             max_time_drift_ms=max_drift,
             time_drift_std_ms=std_drift,
             drift_distribution=distribution,
-            sample_drifts=sample_drifts,
+            sample_indices=sample_indices,
+            sample_cam0_us=cam0_samples_us,
+            sample_cam1_us=cam1_samples_us,
+            sample_drift_ms=drift_samples_ms,
             overall_rating=rating,
             recommendations=recommendations
         )
@@ -290,58 +315,48 @@ class TimestampAnalyzer:
         
         Args:
             input_dir: Directory containing timestamp files
-            cam0_segments: List of cam0 video segments
-            cam1_segments: List of cam1 video segments
+            cam0_segments: List of cam0 video segments, sorted by segment number
+            cam1_segments: List of cam1 video segments, sorted by segment number
             
         Returns:
             SyncAnalysis for combined timestamps
         """
-        def load_segment_timestamps(segment, camera_id):
+        def load_segment_timestamps(segment):
             """Load timestamps for a single segment."""
             video_name = segment.file_path.stem
             ts_name = video_name.replace('_sbs', '') + '_timestamps.jsonl'
             ts_path = input_dir / ts_name
             
             if ts_path.exists():
-                timestamps = self.load_timestamps(ts_path)
-                return (camera_id, segment.segment_number, timestamps)
+                return self.load_timestamps(ts_path)
             else:
                 logger.warning(f"Timestamp file not found: {ts_path}")
-                return (camera_id, segment.segment_number, [])
+                return []
         
-        # Parallel load all timestamp files
-        all_cam0_timestamps = []
-        all_cam1_timestamps = []
+        # Segments arrive sorted by segment number; results are slotted back by
+        # index so they can be concatenated in order without re-sorting
+        cam0_results: List[List[Dict]] = [[] for _ in cam0_segments]
+        cam1_results: List[List[Dict]] = [[] for _ in cam1_segments]
         
+        # Parallel load all timestamp files
         with ThreadPoolExecutor(max_workers=10) as executor:
-            # Submit all loading tasks
-            futures = []
+            future_to_slot = {}
             
-            for segment in cam0_segments:
-                future = executor.submit(load_segment_timestamps, segment, 'cam0')
-                futures.append(future)
+            for segment_index, segment in enumerate(cam0_segments):
+                future = executor.submit(load_segment_timestamps, segment)
+                future_to_slot[future] = (cam0_results, segment_index)
             
-            for segment in cam1_segments:
-                future = executor.submit(load_segment_timestamps, segment, 'cam1')
-                futures.append(future)
+            for segment_index, segment in enumerate(cam1_segments):
+                future = executor.submit(load_segment_timestamps, segment)
+                future_to_slot[future] = (cam1_results, segment_index)
             
             # Collect results
-            cam0_results = {}
-            cam1_results = {}
-            
-            for future in as_completed(futures):
-                camera_id, segment_num, timestamps = future.result()
-                if camera_id == 'cam0':
-                    cam0_results[segment_num] = timestamps
-                else:
-                    cam1_results[segment_num] = timestamps
-        
-        # Sort by segment number and combine
-        for seg_num in sorted(cam0_results.keys()):
-            all_cam0_timestamps.extend(cam0_results[seg_num])
-        
-        for seg_num in sorted(cam1_results.keys()):
-            all_cam1_timestamps.extend(cam1_results[seg_num])
+            for future in as_completed(future_to_slot):
+                results, segment_index = future_to_slot[future]
+                results[segment_index] = future.result()
+        
+        all_cam0_timestamps = [ts for timestamps in cam0_results for ts in timestamps]
+        all_cam1_timestamps = [ts for timestamps in cam1_results for ts in timestamps]
         
         if not all_cam0_timestamps or not all_cam1_timestamps:
             raise ValueError("No timestamps loaded for analysis")
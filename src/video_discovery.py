@@ -1,9 +1,16 @@
 """Video discovery and segment management for Video Frame Stitcher."""
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import fnmatch
+import json
+import os
 import re
+import shutil
+import subprocess
 import cv2
 import logging
 
@@ -14,6 +21,25 @@ from src.error_handling import (
 
 logger = logging.getLogger(__name__)
 
+# Frame counts already probed in this process, keyed by (path, size, mtime_ns)
+# so that a rewritten file is probed again
+_FRAME_COUNT_CACHE: Dict[Tuple[str, int, int], int] = {}
+
+# Sidecar in the input directory that keeps frame counts between runs
+FRAME_COUNT_CACHE_FILENAME = '.frame_count_cache.json'
+
+# Files smaller than this cannot hold a container header with a video track
+# (a single-frame 2x2 MP4 is ~880 bytes), so they are not probed at all
+_MIN_VIDEO_BYTES = 256
+
+# ffprobe reads the frame count from the container header; optional
+_FFPROBE = shutil.which('ffprobe')
+
+# Open probes with the FFmpeg backend directly instead of trying each
+# backend in turn, when this OpenCV build has it
+_PROBE_BACKEND = (cv2.CAP_FFMPEG if cv2.videoio_registry.hasBackend(cv2.CAP_FFMPEG)
+                  else cv2.CAP_ANY)
+
 
 @dataclass
 class VideoSegment:
@@ -25,6 +51,10 @@ class VideoSegment:
         file_path: Path to the video file
         frame_count: Total number of frames in this video segment
     """
+    # Slots instead of a per-instance __dict__, as for ExtractedFrame.
+    # (dataclass(slots=True) needs Python 3.10.)
+    __slots__ = ('camera_id', 'segment_number', 'file_path', 'frame_count')
+    
     camera_id: str
     segment_number: int
     file_path: Path
@@ -65,8 +95,10 @@ class VideoDiscovery:
         
         Args:
             input_dir: Directory to scan for video files
-            cam0_pattern: Glob pattern for cam0 videos (e.g., "stereo_cam0_sbs_*.mp4")
-            cam1_pattern: Glob pattern for cam1 videos (e.g., "stereo_cam1_sbs_*.mp4")
+            cam0_pattern: Glob pattern for cam0 videos (e.g., "stereo_cam0_sbs_*.mp4"),
+                relative to input_dir; may include subdirectories (e.g., "cam0/*.mp4")
+            cam1_pattern: Glob pattern for cam1 videos (e.g., "stereo_cam1_sbs_*.mp4"),
+                relative to input_dir; may include subdirectories (e.g., "cam1/*.mp4")
             
         Returns:
             Dictionary with camera IDs as keys and sorted lists of VideoSegments as values.
@@ -84,54 +116,78 @@ class VideoDiscovery:
         
         result = {'cam0': [], 'cam1': []}
         
-        # Process cam0 videos
-        for video_path in input_dir.glob(cam0_pattern):
-            if video_path.is_file():
-                segment_number = VideoDiscovery._extract_segment_number(video_path.name)
-                if segment_number is not None:
-                    frame_count = VideoDiscovery.get_frame_count(video_path)
-                    if frame_count > 0:
-                        segment = VideoSegment(
-                            camera_id='cam0',
-                            segment_number=segment_number,
-                            file_path=video_path,
-                            frame_count=frame_count
-                        )
-                        result['cam0'].append(segment)
-                    else:
-                        log_warning(
-                            f"Skipping video file with 0 frames or unable to read frame count",
-                            video_path
-                        )
-        
-        # Process cam1 videos
-        for video_path in input_dir.glob(cam1_pattern):
-            if video_path.is_file():
+        # Frame counts recorded by earlier runs over this directory
+        cached_counts = VideoDiscovery._load_frame_count_cache(input_dir)
+        
+        # Collect candidate files for both cameras before probing them
+        candidates = []
+        file_names = None
+        for camera_id, pattern in (('cam0', cam0_pattern), ('cam1', cam1_pattern)):
+            if '/' in pattern or os.sep in pattern:
+                # Patterns with a directory component are resolved by Path.glob
+                matches = [path for path in input_dir.glob(pattern) if path.is_file()]
+            else:
+                # File name patterns are matched against a single scan of the
+                # directory shared by both cameras
+                if file_names is None:
+                    with os.scandir(input_dir) as it:
+                        file_names = [entry.name for entry in it if entry.is_file()]
+                
+                # Compile each glob once instead of once per file name; normcase
+                # keeps matching case-insensitive on Windows, like Path.glob
+                match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+                matches = [input_dir / name for name in file_names
+                           if match(os.path.normcase(name))]
+            
+            for video_path in matches:
                 segment_number = VideoDiscovery._extract_segment_number(video_path.name)
                 if segment_number is not None:
-                    frame_count = VideoDiscovery.get_frame_count(video_path)
-                    if frame_count > 0:
-                        segment = VideoSegment(
-                            camera_id='cam1',
-                            segment_number=segment_number,
-                            file_path=video_path,
-                            frame_count=frame_count
-                        )
-                        result['cam1'].append(segment)
-                    else:
-                        log_warning(
-                            f"Skipping video file with 0 frames or unable to read frame count",
-                            video_path
-                        )
+                    candidates.append((camera_id, segment_number, video_path))
+        
+        # Seed the in-process cache only for the files about to be probed;
+        # get_frame_count stats each one, so an entry for a rewritten file
+        # simply misses
+        for _, _, video_path in candidates:
+            entry = cached_counts.get(video_path.relative_to(input_dir).as_posix())
+            if entry is not None:
+                size, mtime_ns, frame_count = entry
+                _FRAME_COUNT_CACHE[(os.fspath(video_path), size, mtime_ns)] = frame_count
+        
+        # Frame count probes are I/O bound, so run them concurrently
+        max_workers = max(1, min(32, (os.cpu_count() or 1) * 4, len(candidates)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            frame_counts = list(executor.map(
+                VideoDiscovery.get_frame_count,
+                [video_path for _, _, video_path in candidates]
+            ))
+        
+        for (camera_id, segment_number, video_path), frame_count in zip(candidates, frame_counts):
+            if frame_count > 0:
+                segment = VideoSegment(
+                    camera_id=camera_id,
+                    segment_number=segment_number,
+                    file_path=video_path,
+                    frame_count=frame_count
+                )
+                result[camera_id].append(segment)
+            else:
+                log_warning(
+                    f"Skipping video file with 0 frames or unable to read frame count",
+                    video_path
+                )
         
         # Sort segments by segment number
-        result['cam0'].sort()
-        result['cam1'].sort()
+        # A C-level key avoids a Python __lt__ call per comparison
+        by_segment_number = attrgetter('segment_number')
+        result['cam0'].sort(key=by_segment_number)
+        result['cam1'].sort(key=by_segment_number)
+        
+        VideoDiscovery._save_frame_count_cache(input_dir, cached_counts, result)
         
         return result
     
     @staticmethod
-    def _extract_segment_number(filename: str) -> int:
+    def _extract_segment_number(filename: str) -> Optional[int]:
         """Extract segment number from filename.
         
         Looks for numeric patterns in the filename. Assumes the segment number
@@ -143,24 +199,31 @@ class VideoDiscovery:
         Returns:
             Segment number as integer, or None if no number found
         """
-        # Remove file extension
-        name_without_ext = Path(filename).stem
+        # Remove file extension (same rule as Path.stem, without building a Path)
+        dot = filename.rfind('.')
+        name_without_ext = filename[:dot] if 0 < dot < len(filename) - 1 else filename
         
-        # Find all sequences of digits
-        numbers = re.findall(r'\d+', name_without_ext)
+        # Scan backwards to the last run of digits (typically the segment number)
+        end = len(name_without_ext)
+        while end > 0 and not name_without_ext[end - 1].isdecimal():
+            end -= 1
+        if end == 0:
+            return None
         
-        if numbers:
-            # Return the last number found (typically the segment number)
-            return int(numbers[-1])
+        start = end - 1
+        while start > 0 and name_without_ext[start - 1].isdecimal():
+            start -= 1
         
-        return None
+        return int(name_without_ext[start:end])
     
     @staticmethod
     def get_frame_count(video_path: Path) -> int:
         """Get total frame count from a video file.
         
-        Uses OpenCV to open the video file and retrieve the frame count
-        from the video metadata.
+        Uses ffprobe when it is installed, as it only reads the container
+        header, and otherwise OpenCV to retrieve the frame count from the
+        video metadata. Counts are cached per (path, size, mtime), so an
+        unchanged file is only probed once.
         
         Args:
             video_path: Path to the video file
@@ -169,19 +232,160 @@ class VideoDiscovery:
             Total number of frames in the video, or 0 if the video cannot be opened
             or frame count cannot be determined
         """
+        key = VideoDiscovery._frame_count_key(video_path)
+        if key is not None:
+            cached = _FRAME_COUNT_CACHE.get(key)
+            if cached is not None:
+                return cached
+            if key[1] < _MIN_VIDEO_BYTES:
+                return 0
+        
+        frame_count = VideoDiscovery._ffprobe_frame_count(video_path)
+        if frame_count is None:
+            frame_count = VideoDiscovery._probe_frame_count(video_path)
+        
+        # Failed probes are not cached; the file may still be being written
+        if key is not None and frame_count > 0:
+            _FRAME_COUNT_CACHE[key] = frame_count
+        
+        return frame_count
+    
+    @staticmethod
+    def _frame_count_key(video_path: Path) -> Optional[Tuple[str, int, int]]:
+        """Return the frame count cache key for a file, or None if it cannot be stat'ed."""
+        try:
+            st = os.stat(video_path)
+        except OSError:
+            return None
+        return (os.fspath(video_path), st.st_size, st.st_mtime_ns)
+    
+    @staticmethod
+    def _ffprobe_frame_count(video_path: Path) -> Optional[int]:
+        """Read the frame count of the first video stream with ffprobe.
+        
+        Args:
+            video_path: Path to the video file
+            
+        Returns:
+            Frame count from the container header, or None if ffprobe is not
+            installed or does not report a usable count
+        """
+        if _FFPROBE is None:
+            return None
+        
         try:
-            cap = cv2.VideoCapture(str(video_path))
+            completed = subprocess.run(
+                [_FFPROBE, '-v', 'error', '-select_streams', 'v:0',
+                 '-show_entries', 'stream=nb_frames',
+                 '-of', 'default=nokey=1:noprint_wrappers=1', str(video_path)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                timeout=2
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        
+        # nb_frames is "N/A" for containers that do not store it
+        output = completed.stdout.decode('ascii', 'replace').strip()
+        if completed.returncode != 0 or not output.isdigit() or int(output) == 0:
+            return None
+        return int(output)
+    
+    @staticmethod
+    def _probe_frame_count(video_path: Path) -> int:
+        """Read the frame count from the video metadata with OpenCV.
+        
+        Args:
+            video_path: Path to the video file
+            
+        Returns:
+            Total number of frames in the video, or 0 if it cannot be determined
+        """
+        cap = None
+        try:
+            cap = cv2.VideoCapture(str(video_path), _PROBE_BACKEND)
             if not cap.isOpened():
                 log_warning(f"Unable to open video file", video_path)
                 return 0
             
             frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            cap.release()
             
             return frame_count if frame_count > 0 else 0
         except Exception as e:
             log_warning(f"Error reading frame count: {e}", video_path)
             return 0
+        finally:
+            # Release on every path so probing many files does not leak handles
+            if cap is not None:
+                cap.release()
+    
+    @staticmethod
+    def _load_frame_count_cache(input_dir: Path) -> Dict[str, list]:
+        """Load the frame count sidecar of a directory.
+        
+        Entries that are not three integers with a positive frame count are
+        dropped, so a hand-edited or corrupt sidecar cannot poison the cache.
+        
+        Args:
+            input_dir: Directory that may contain a frame count sidecar
+            
+        Returns:
+            Sidecar entries as {relative path: [size, mtime_ns, frame_count]};
+            empty if the sidecar is missing or unreadable
+        """
+        try:
+            with open(input_dir / FRAME_COUNT_CACHE_FILENAME, 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        
+        # type() rather than isinstance() so JSON booleans are rejected too
+        return {
+            name: entry for name, entry in entries.items()
+            if isinstance(entry, list) and len(entry) == 3
+            and all(type(value) is int for value in entry)
+            and entry[0] >= 0 and entry[2] > 0
+        }
+    
+    @staticmethod
+    def _save_frame_count_cache(input_dir: Path, previous: Dict[str, list],
+                                segments: Dict[str, List[VideoSegment]]) -> None:
+        """Write the frame counts of discovered segments to the directory sidecar.
+        
+        The sidecar is only rewritten when its contents change. Failing to
+        write it (e.g. a read-only input directory) is not an error.
+        
+        Args:
+            input_dir: Directory the segments were discovered in
+            previous: Entries loaded from the existing sidecar
+            segments: Discovered segments grouped by camera
+        """
+        entries = {}
+        for segment_list in segments.values():
+            for segment in segment_list:
+                key = VideoDiscovery._frame_count_key(segment.file_path)
+                if key is not None and _FRAME_COUNT_CACHE.get(key) == segment.frame_count:
+                    entries[segment.file_path.relative_to(input_dir).as_posix()] = [
+                        key[1], key[2], segment.frame_count
+                    ]
+        
+        if entries == previous:
+            return
+        
+        sidecar = input_dir / FRAME_COUNT_CACHE_FILENAME
+        tmp_path = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, sidecar)
+        except OSError as e:
+            logger.debug(f"Could not write frame count cache {sidecar}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
     
     @staticmethod
     def validate_segment_pairing(cam0_segments: List[VideoSegment], cam1_segments: List[VideoSegment]) -> List[str]:
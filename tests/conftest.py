@@ -0,0 +1,41 @@
+"""Shared pytest configuration for the Video Frame Stitcher test suite."""
+
+import os
+import shutil
+import tempfile
+
+from hypothesis import settings
+
+
+# Property tests without an explicit max_examples use the active profile.
+# The default "dev" profile keeps local runs quick; set HYPOTHESIS_PROFILE=ci
+# for the exhaustive run, or HYPOTHESIS_PROFILE=nightly for extended coverage.
+settings.register_profile("dev", max_examples=10)
+settings.register_profile("ci", max_examples=100)
+settings.register_profile("nightly", max_examples=200)
+settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "dev"))
+
+
+# Free space /dev/shm needs before temporary directories are moved there;
+# container defaults (64 MB) are far too small for the videos and frames
+_MIN_SHM_FREE_BYTES = 512 * 1024 ** 2
+
+
+def pytest_configure(config):
+    """Put temporary directories on tmpfs when it has room for the suite.
+    
+    The suite writes many small frame images; on tmpfs those writes stay in
+    memory. An explicit TMPDIR always takes precedence, and /dev/shm is only
+    used when it has at least _MIN_SHM_FREE_BYTES free.
+    """
+    shm = '/dev/shm'
+    if os.environ.get('TMPDIR') or not os.path.isdir(shm) or not os.access(shm, os.W_OK):
+        return
+    try:
+        if shutil.disk_usage(shm).free < _MIN_SHM_FREE_BYTES:
+            return
+    except OSError:
+        return
+    os.environ['TMPDIR'] = shm
+    # Drop tempfile's cached default so the new TMPDIR is picked up
+    tempfile.tempdir = None
@@ -1,10 +1,13 @@
 """Tests for directory management utilities."""
 
+import io
+import os
+import stat
 import pytest
 from pathlib import Path
-import tempfile
-import shutil
+from unittest import mock
 from hypothesis import given, strategies as st, settings
+from PIL import Image
 
 from src.directory_management import (
     create_output_structure,
@@ -15,16 +18,58 @@ from src.directory_management import (
     get_directory_info
 )
 from src.error_handling import OutputDirectoryError
+from src.frame_extraction import ExtractedFrame
+from src.frame_stitching import FrameStitcher
+
+
+# Upper bound on frames per example for the directory organization property;
+# the exhaustive ci and nightly profiles exercise the full range
+_MAX_FRAMES = 10 if os.getenv("HYPOTHESIS_PROFILE", "dev") in ("ci", "nightly") else 3
+
+# Hypothesis strategies, built once and shared by the property tests
+_DEPTH = st.integers(min_value=1, max_value=5)
+_NPARTS = st.integers(min_value=1, max_value=5)
+_NSUB = st.integers(min_value=0, max_value=5)
+_NFRAMES = st.integers(min_value=1, max_value=_MAX_FRAMES)
+
+
+def _encode_once(size, color):
+    """Encode a solid-color PNG and return its bytes."""
+    buf = io.BytesIO()
+    Image.new('RGB', size, color=color).save(buf, 'PNG', compress_level=0)
+    return buf.getvalue()
+
+
+def _assert_is_dir(path):
+    """Assert that path exists and is a directory using a single stat call."""
+    assert stat.S_ISDIR(os.stat(path).st_mode)
+
+
+def _count_png(directory):
+    """Count .png files in a directory via os.scandir (no Path allocations)."""
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if entry.name.endswith('.png'))
+
+
+# Solid-color frames are deterministic, so encode them once per module
+_RED_PNG = _encode_once((100, 100), 'red')
+_BLUE_PNG = _encode_once((100, 100), 'blue')
+
+
+def _fake_stitch_pair(self, cam0_path, cam1_path, output_path, frame_number=0):
+    """Stand-in for FrameStitcher.stitch_pair that skips image decode/encode.
+    
+    The real stitch_frames still pairs frames, chooses output paths and
+    returns StitchedFrames; only the per-pair encode is replaced by writing
+    a pre-encoded PNG.
+    """
+    output_path.write_bytes(_RED_PNG)
 
 
 # Property-based tests
 
-@given(
-    depth=st.integers(min_value=1, max_value=5),
-    num_parts=st.integers(min_value=1, max_value=5)
-)
-@settings(max_examples=100)
-def test_property_automatic_directory_creation(depth, num_parts):
+@given(depth=_DEPTH, num_parts=_NPARTS)
+def test_property_automatic_directory_creation(tmp_path_factory, depth, num_parts):
     """Property 14: Automatic Directory Creation
     
     **Validates: Requirements 8.3**
@@ -35,183 +80,152 @@ def test_property_automatic_directory_creation(depth, num_parts):
     """
     # Feature: video-frame-stitcher, Property 14: Automatic Directory Creation
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        base = Path(tmpdir)
-        
-        # Generate a random nested path that doesn't exist
-        path_parts = [f"dir_{i}" for i in range(num_parts)]
-        nested_path = base / Path(*path_parts)
-        
-        # Verify path doesn't exist initially
-        assert not nested_path.exists()
-        
-        # Call ensure_directory_exists
-        ensure_directory_exists(nested_path)
-        
-        # Verify directory was created
-        assert nested_path.exists()
-        assert nested_path.is_dir()
-        
-        # Verify all parent directories were created
-        current = nested_path
-        for _ in range(num_parts):
-            assert current.exists()
-            assert current.is_dir()
-            current = current.parent
+    base = tmp_path_factory.mktemp("nested")
+    
+    # Generate a random nested path that doesn't exist
+    path_parts = [f"dir_{i}" for i in range(num_parts)]
+    nested_path = base / Path(*path_parts)
+    
+    # Verify path doesn't exist initially
+    assert not nested_path.exists()
+    
+    # Call ensure_directory_exists
+    ensure_directory_exists(nested_path)
+    
+    # Verify directory was created
+    _assert_is_dir(nested_path)
+    
+    # Verify all parent directories were created (plain strings, no Path.parent walk)
+    current = str(base)
+    for part in path_parts:
+        current = os.path.join(current, part)
+        assert os.path.isdir(current)
 
 
-@given(
-    num_subdirs=st.integers(min_value=0, max_value=5)
-)
-@settings(max_examples=100)
-def test_property_directory_structure_creation(num_subdirs):
+@given(num_subdirs=_NSUB)
+def test_property_directory_structure_creation(tmp_path_factory, num_subdirs):
     """Property test for create_output_structure with subdirectories.
     
     Verifies that create_output_structure creates the base directory
     and all specified subdirectories.
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        base = Path(tmpdir) / "output"
-        subdirs = [f"subdir_{i}" for i in range(num_subdirs)]
-        
-        # Create structure
-        create_output_structure(base, subdirs if num_subdirs > 0 else None)
-        
-        # Verify base directory exists
-        assert base.exists()
-        assert base.is_dir()
-        
-        # Verify all subdirectories exist
-        for subdir in subdirs:
-            subdir_path = base / subdir
-            assert subdir_path.exists()
-            assert subdir_path.is_dir()
+    base = tmp_path_factory.mktemp("structure") / "output"
+    subdirs = [f"subdir_{i}" for i in range(num_subdirs)]
+    
+    # Create structure
+    create_output_structure(base, subdirs if num_subdirs > 0 else None)
+    
+    # Verify base directory exists
+    _assert_is_dir(base)
+    
+    # Verify all subdirectories exist
+    for subdir in subdirs:
+        subdir_path = base / subdir
+        _assert_is_dir(subdir_path)
 
 
 # Unit tests
 
-def test_create_output_structure_basic():
+def test_create_output_structure_basic(tmp_path):
     """Test basic directory creation."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        base = Path(tmpdir) / "output"
-        
-        create_output_structure(base)
-        
-        assert base.exists()
-        assert base.is_dir()
+    base = tmp_path / "output"
+    
+    create_output_structure(base)
+    
+    _assert_is_dir(base)
 
 
-def test_create_output_structure_with_subdirs():
+def test_create_output_structure_with_subdirs(tmp_path):
     """Test directory creation with subdirectories."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        base = Path(tmpdir) / "output"
-        subdirs = ["cam0", "cam1"]
-        
-        create_output_structure(base, subdirs)
-        
-        assert base.exists()
-        assert (base / "cam0").exists()
-        assert (base / "cam1").exists()
+    base = tmp_path / "output"
+    subdirs = ["cam0", "cam1"]
+    
+    create_output_structure(base, subdirs)
+    
+    _assert_is_dir(base)
+    _assert_is_dir(base / "cam0")
+    _assert_is_dir(base / "cam1")
 
 
-def test_create_output_structure_already_exists():
+def test_create_output_structure_already_exists(tmp_path):
     """Test that existing directories don't cause errors."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        base = Path(tmpdir) / "output"
-        base.mkdir()
-        
-        # Should not raise error
-        create_output_structure(base)
-        
-        assert base.exists()
+    base = tmp_path / "output"
+    base.mkdir()
+    
+    # Should not raise error
+    create_output_structure(base)
+    
+    _assert_is_dir(base)
 
 
-def test_ensure_directory_exists_creates_parents():
+def test_ensure_directory_exists_creates_parents(tmp_path):
     """Test automatic parent directory creation."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        nested = Path(tmpdir) / "a" / "b" / "c"
-        
-        ensure_directory_exists(nested)
-        
-        assert nested.exists()
-        assert nested.is_dir()
-        assert (Path(tmpdir) / "a").exists()
-        assert (Path(tmpdir) / "a" / "b").exists()
+    nested = tmp_path / "a" / "b" / "c"
+    
+    ensure_directory_exists(nested)
+    
+    _assert_is_dir(nested)
+    _assert_is_dir(tmp_path / "a")
+    _assert_is_dir(tmp_path / "a" / "b")
 
 
-def test_ensure_directory_exists_file_conflict():
+def test_ensure_directory_exists_file_conflict(tmp_path):
     """Test error when path exists as file."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        file_path = Path(tmpdir) / "file.txt"
-        file_path.touch()
-        
-        with pytest.raises(OutputDirectoryError) as exc_info:
-            ensure_directory_exists(file_path)
-        
-        assert "not a directory" in str(exc_info.value).lower()
-
-
-def test_setup_extraction_directories():
-    """Test extraction directory structure setup."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        base = Path(tmpdir) / "extracted"
-        
-        result = setup_extraction_directories(base)
-        
-        assert result['base'] == base
-        assert result['cam0'] == base / 'cam0'
-        assert result['cam1'] == base / 'cam1'
-        
-        assert base.exists()
-        assert result['cam0'].exists()
-        assert result['cam1'].exists()
-
-
-def test_setup_stitching_directory():
-    """Test stitching directory setup."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        output = Path(tmpdir) / "stitched"
-        
-        result = setup_stitching_directory(output)
-        
-        assert result == output
-        assert output.exists()
-        assert output.is_dir()
+    file_path = tmp_path / "file.txt"
+    file_path.touch()
+    
+    with pytest.raises(OutputDirectoryError) as exc_info:
+        ensure_directory_exists(file_path)
+    
+    assert "not a directory" in str(exc_info.value).lower()
 
 
-def test_validate_directory_writable():
-    """Test directory writability check."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        writable_dir = Path(tmpdir)
-        
-        assert validate_directory_writable(writable_dir) is True
+def test_directory_helpers_happy_path(tmp_path):
+    """Test the setup, writability and info helpers on one temp directory."""
+    # Extraction directory structure setup
+    base = tmp_path / "extracted"
+    
+    result = setup_extraction_directories(base)
+    
+    assert result['base'] == base
+    assert result['cam0'] == base / 'cam0'
+    assert result['cam1'] == base / 'cam1'
+    
+    _assert_is_dir(base)
+    _assert_is_dir(result['cam0'])
+    _assert_is_dir(result['cam1'])
+    
+    # Stitching directory setup
+    output = tmp_path / "stitched"
+    
+    result = setup_stitching_directory(output)
+    
+    assert result == output, "setup_stitching_directory should return its input"
+    _assert_is_dir(output)
+    
+    # Directory writability check
+    assert validate_directory_writable(tmp_path) is True, "tmp_path should be writable"
+    
+    # Directory info: two files plus the subdirectories created above
+    dir_path = str(tmp_path)
+    open(os.path.join(dir_path, "file1.txt"), "wb").close()
+    open(os.path.join(dir_path, "file2.txt"), "wb").close()
+    
+    info = get_directory_info(tmp_path)
+    
+    assert info['exists'] is True
+    assert info['is_directory'] is True
+    assert info['is_writable'] is True
+    assert info['file_count'] == 2, "only files should be counted, not subdirectories"
 
 
-def test_validate_directory_writable_nonexistent():
+def test_validate_directory_writable_nonexistent(tmp_path):
     """Test writability check on non-existent directory."""
-    nonexistent = Path("/nonexistent/path/that/does/not/exist")
+    nonexistent = tmp_path / "absent_subdir"
     
     assert validate_directory_writable(nonexistent) is False
 
 
-def test_get_directory_info_exists():
-    """Test getting info for existing directory."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        dir_path = Path(tmpdir)
-        
-        # Create some test files
-        (dir_path / "file1.txt").touch()
-        (dir_path / "file2.txt").touch()
-        (dir_path / "subdir").mkdir()
-        
-        info = get_directory_info(dir_path)
-        
-        assert info['exists'] is True
-        assert info['is_directory'] is True
-        assert info['is_writable'] is True
-        assert info['file_count'] == 2  # Only files, not subdirectories
-
-
 def test_get_directory_info_nonexistent():
     """Test getting info for non-existent directory."""
     nonexistent = Path("/nonexistent/path")
@@ -225,11 +239,9 @@ def test_get_directory_info_nonexistent():
 
 
 # Property 6: Directory Organization test
-@given(
-    num_frames=st.integers(min_value=1, max_value=10)
-)
-@settings(max_examples=50, deadline=None)
-def test_property_directory_organization(num_frames):
+@given(num_frames=_NFRAMES)
+@settings(deadline=None)
+def test_property_directory_organization(tmp_path_factory, num_frames):
     """Property 6: Directory Organization
     
     **Validates: Requirements 2.3, 8.1, 8.2, 8.5**
@@ -240,73 +252,69 @@ def test_property_directory_organization(num_frames):
     """
     # Feature: video-frame-stitcher, Property 6: Directory Organization
     
-    import numpy as np
-    from PIL import Image
-    from src.frame_extraction import FrameExtractor, ExtractedFrame
-    from src.frame_stitching import FrameStitcher
+    base = tmp_path_factory.mktemp("organization")
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        base = Path(tmpdir)
-        
-        # Setup directories
-        extracted_base = base / "extracted"
-        stitched_dir = base / "stitched"
-        
-        extraction_dirs = setup_extraction_directories(extracted_base)
-        setup_stitching_directory(stitched_dir)
-        
-        # Create some test frames for both cameras
-        cam0_frames = []
-        cam1_frames = []
-        
-        for i in range(1, num_frames + 1):
-            frame_num = i * 100 + 1  # Simulate sampling pattern
-            
-            # Create cam0 frame
-            img = Image.new('RGB', (100, 100), color='red')
-            cam0_path = extraction_dirs['cam0'] / f"frame_{frame_num:04d}.png"
-            img.save(cam0_path)
-            cam0_frames.append(ExtractedFrame(frame_num, 'cam0', cam0_path))
-            
-            # Create cam1 frame
-            img = Image.new('RGB', (100, 100), color='blue')
-            cam1_path = extraction_dirs['cam1'] / f"frame_{frame_num:04d}.png"
-            img.save(cam1_path)
-            cam1_frames.append(ExtractedFrame(frame_num, 'cam1', cam1_path))
-        
-        # Verify extracted frames are in camera subdirectories
-        for frame in cam0_frames:
-            assert frame.file_path.parent == extraction_dirs['cam0']
-            assert frame.file_path.exists()
-        
-        for frame in cam1_frames:
-            assert frame.file_path.parent == extraction_dirs['cam1']
-            assert frame.file_path.exists()
-        
-        # Stitch frames
-        stitcher = FrameStitcher('png')
+    # Setup directories
+    extracted_base = base / "extracted"
+    stitched_dir = base / "stitched"
+    
+    extraction_dirs = setup_extraction_directories(extracted_base)
+    setup_stitching_directory(stitched_dir)
+    
+    # Create some test frames for both cameras
+    cam0_frames = []
+    cam1_frames = []
+    
+    # Build frame paths as plain strings; Path is only needed for ExtractedFrame
+    cam0_dir = str(extraction_dirs['cam0'])
+    cam1_dir = str(extraction_dirs['cam1'])
+    
+    for i in range(1, num_frames + 1):
+        frame_num = i * 100 + 1  # Simulate sampling pattern
+        filename = f"frame_{frame_num:04d}.png"
+        
+        # Create cam0 frame
+        cam0_path = os.path.join(cam0_dir, filename)
+        with open(cam0_path, 'wb') as f:
+            f.write(_RED_PNG)
+        cam0_frames.append(ExtractedFrame(frame_num, 'cam0', Path(cam0_path)))
+        
+        # Create cam1 frame
+        cam1_path = os.path.join(cam1_dir, filename)
+        with open(cam1_path, 'wb') as f:
+            f.write(_BLUE_PNG)
+        cam1_frames.append(ExtractedFrame(frame_num, 'cam1', Path(cam1_path)))
+    
+    # Verify extracted frames are in camera subdirectories
+    for frame in cam0_frames:
+        assert frame.file_path.parent == extraction_dirs['cam0']
+        assert frame.file_path.exists()
+    
+    for frame in cam1_frames:
+        assert frame.file_path.parent == extraction_dirs['cam1']
+        assert frame.file_path.exists()
+    
+    # Stitch frames (image content is irrelevant to this property)
+    stitcher = FrameStitcher('png')
+    with mock.patch.object(FrameStitcher, 'stitch_pair', _fake_stitch_pair):
         stitched_frames = stitcher.stitch_frames(
             cam0_frames, 
             cam1_frames, 
             stitched_dir,
             lambda x, y: None  # No-op progress callback
         )
-        
-        # Verify all stitched frames are in single output directory
-        for stitched in stitched_frames:
-            assert stitched.file_path.parent == stitched_dir
-            assert stitched.file_path.exists()
-        
-        # Verify directory structure
-        assert extraction_dirs['cam0'].exists()
-        assert extraction_dirs['cam1'].exists()
-        assert stitched_dir.exists()
-        
-        # Verify no stitched frames in extraction directories
-        cam0_files = list(extraction_dirs['cam0'].glob('*.png'))
-        cam1_files = list(extraction_dirs['cam1'].glob('*.png'))
-        stitched_files = list(stitched_dir.glob('*.png'))
-        
-        assert len(cam0_files) == num_frames
-        assert len(cam1_files) == num_frames
-        assert len(stitched_files) == num_frames
+    
+    # Verify all stitched frames are in single output directory
+    for stitched in stitched_frames:
+        assert stitched.file_path.parent == stitched_dir
+        assert stitched.file_path.exists()
+    
+    # Verify directory structure
+    _assert_is_dir(extraction_dirs['cam0'])
+    _assert_is_dir(extraction_dirs['cam1'])
+    _assert_is_dir(stitched_dir)
+    
+    # Verify no stitched frames in extraction directories
+    assert _count_png(extraction_dirs['cam0']) == num_frames
+    assert _count_png(extraction_dirs['cam1']) == num_frames
+    assert _count_png(stitched_dir) == num_frames
@@ -1,8 +1,10 @@
 """Unit tests for frame extraction components."""
 
+import functools
+import os
+import re
 import pytest
 from pathlib import Path
-import tempfile
 import shutil
 import cv2
 import numpy as np
@@ -10,77 +12,83 @@ from src.frame_extraction import ExtractedFrame, FrameExtractor
 from src.video_discovery import VideoSegment
 
 
+# MJPEG is intra-only, so encoding skips motion search entirely
+_FOURCC_MJPG = cv2.VideoWriter_fourcc(*'MJPG')
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _pin_cv2_threads():
+    """Run OpenCV single-threaded; its thread pool only adds overhead on test-sized frames."""
+    previous = cv2.getNumThreads()
+    cv2.setNumThreads(1)
+    yield
+    cv2.setNumThreads(previous)
+
+
+@pytest.fixture(scope="session")
+def encoded_video(tmp_path_factory):
+    """Return an encoder that writes each test video once per session.
+    
+    The returned callable takes (frame_count, width, height) and returns the
+    path of a cached MJPG video; callers must not modify the file.
+    """
+    cache_dir = tmp_path_factory.mktemp("sample_videos")
+    
+    @functools.lru_cache(maxsize=None)
+    def _encode_video(frame_count: int, width: int, height: int) -> Path:
+        """Encode a simple test video with specified frame count."""
+        path = cache_dir / f"video_{frame_count}_{width}x{height}.avi"
+        out = cv2.VideoWriter(os.fspath(path), _FOURCC_MJPG, 30.0, (width, height))
+        
+        # A different solid color for each frame, written through one buffer
+        idx = np.arange(frame_count)
+        colors = np.stack([idx * 10 % 256, idx * 20 % 256, idx * 30 % 256],
+                          axis=1).astype(np.uint8)
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        for color in colors:
+            frame[...] = color
+            out.write(frame)
+        
+        out.release()
+        return path
+    
+    return _encode_video
+
+
 class TestExtractedFrame:
     """Test suite for ExtractedFrame dataclass."""
     
-    def test_extracted_frame_creation(self):
+    @pytest.mark.parametrize("number,camera_id,file_path", [
+        (101, 'cam0', Path('extracted_frames/cam0/frame_0101.png')),
+        (201, 'cam1', Path('extracted_frames/cam1/frame_0201.png')),
+    ], ids=["cam0", "cam1"])
+    def test_extracted_frame_creation(self, number, camera_id, file_path):
         """Test creating an ExtractedFrame instance with valid data."""
         frame = ExtractedFrame(
-            global_frame_number=101,
-            camera_id='cam0',
-            file_path=Path('extracted_frames/cam0/frame_0101.png')
+            global_frame_number=number,
+            camera_id=camera_id,
+            file_path=file_path
         )
         
-        assert frame.global_frame_number == 101
-        assert frame.camera_id == 'cam0'
-        assert frame.file_path == Path('extracted_frames/cam0/frame_0101.png')
-    
-    def test_extracted_frame_with_cam1(self):
-        """Test creating an ExtractedFrame for cam1."""
-        frame = ExtractedFrame(
-            global_frame_number=201,
-            camera_id='cam1',
-            file_path=Path('extracted_frames/cam1/frame_0201.png')
-        )
-        
-        assert frame.global_frame_number == 201
-        assert frame.camera_id == 'cam1'
-        assert frame.file_path == Path('extracted_frames/cam1/frame_0201.png')
-    
-    def test_extracted_frame_equality(self):
-        """Test that two ExtractedFrame instances with same data are equal."""
+        assert frame.global_frame_number == number
+        assert frame.camera_id == camera_id
+        assert frame.file_path == file_path
+    
+    @pytest.mark.parametrize("other,expected_equal", [
+        ((1, 'cam0', Path('frame_0001.png')), True),
+        ((2, 'cam0', Path('frame_0002.png')), False),
+        ((1, 'cam1', Path('cam1/frame_0001.png')), False),
+    ], ids=["same_data", "different_frame_number", "different_camera"])
+    def test_extracted_frame_equality(self, other, expected_equal):
+        """Test that ExtractedFrame equality compares all fields."""
         frame1 = ExtractedFrame(
             global_frame_number=1,
             camera_id='cam0',
             file_path=Path('frame_0001.png')
         )
-        frame2 = ExtractedFrame(
-            global_frame_number=1,
-            camera_id='cam0',
-            file_path=Path('frame_0001.png')
-        )
-        
-        assert frame1 == frame2
-    
-    def test_extracted_frame_inequality(self):
-        """Test that ExtractedFrame instances with different data are not equal."""
-        frame1 = ExtractedFrame(
-            global_frame_number=1,
-            camera_id='cam0',
-            file_path=Path('frame_0001.png')
-        )
-        frame2 = ExtractedFrame(
-            global_frame_number=2,
-            camera_id='cam0',
-            file_path=Path('frame_0002.png')
-        )
-        
-        assert frame1 != frame2
-    
-    def test_extracted_frame_with_different_cameras(self):
-        """Test that frames from different cameras are not equal even with same frame number."""
-        frame1 = ExtractedFrame(
-            global_frame_number=1,
-            camera_id='cam0',
-            file_path=Path('cam0/frame_0001.png')
-        )
-        frame2 = ExtractedFrame(
-            global_frame_number=1,
-            camera_id='cam1',
-            file_path=Path('cam1/frame_0001.png')
-        )
+        frame2 = ExtractedFrame(*other)
         
-        assert frame1 != frame2
+        assert (frame1 == frame2) is expected_equal
     
     def test_extracted_frame_attributes_are_accessible(self):
         """Test that all attributes can be accessed after creation."""
@@ -113,69 +121,44 @@ class TestExtractedFrame:
 class TestFrameExtractor:
     """Test suite for FrameExtractor class."""
     
-    @pytest.fixture
-    def temp_dir(self):
-        """Create a temporary directory for test files."""
-        temp_path = Path(tempfile.mkdtemp())
-        yield temp_path
-        # Cleanup after test
-        shutil.rmtree(temp_path)
-    
-    @pytest.fixture
-    def sample_video(self):
-        """Create a sample video file for testing."""
+    @pytest.fixture(scope="session")
+    def sample_video(self, encoded_video):
+        """Create sample video files for testing.
+        
+        Each (frame_count, width, height) combination is encoded once per
+        session; later requests copy the cached file to the requested path.
+        """
         def _create_video(path: Path, frame_count: int = 10, width: int = 640, height: int = 480):
-            """Create a simple test video with specified frame count."""
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(str(path), fourcc, 30.0, (width, height))
-            
-            for i in range(frame_count):
-                # Create a simple frame with a different color for each frame
-                frame = np.zeros((height, width, 3), dtype=np.uint8)
-                frame[:, :] = (i * 10 % 256, (i * 20) % 256, (i * 30) % 256)
-                out.write(frame)
-            
-            out.release()
+            """Place a test video with specified frame count at path."""
+            shutil.copyfile(encoded_video(frame_count, width, height), path)
         
         return _create_video
     
     # Test __init__
     
-    def test_frame_extractor_init_with_valid_params(self):
+    @pytest.mark.parametrize("interval,fmt", [
+        (100, 'png'),
+        (50, 'jpg'),
+        (50, 'jpeg'),
+    ])
+    def test_frame_extractor_init_with_valid_params(self, interval, fmt):
         """Test creating FrameExtractor with valid parameters."""
-        extractor = FrameExtractor(sampling_interval=100, output_format='png')
-        
-        assert extractor.sampling_interval == 100
-        assert extractor.output_format == 'png'
-    
-    def test_frame_extractor_init_with_jpg_format(self):
-        """Test creating FrameExtractor with jpg format."""
-        extractor = FrameExtractor(sampling_interval=50, output_format='jpg')
-        
-        assert extractor.sampling_interval == 50
-        assert extractor.output_format == 'jpg'
-    
-    def test_frame_extractor_init_with_jpeg_format(self):
-        """Test creating FrameExtractor with jpeg format (normalized to jpg)."""
-        extractor = FrameExtractor(sampling_interval=50, output_format='jpeg')
+        extractor = FrameExtractor(sampling_interval=interval, output_format=fmt)
         
-        assert extractor.output_format == 'jpeg'
+        assert extractor.sampling_interval == interval
+        assert extractor.output_format == fmt
     
-    def test_frame_extractor_init_with_invalid_sampling_interval(self):
+    @pytest.mark.parametrize("bad", [0, -1])
+    def test_frame_extractor_init_with_invalid_sampling_interval(self, bad):
         """Test that ValueError is raised for sampling_interval < 1."""
         with pytest.raises(ValueError, match="sampling_interval must be >= 1"):
-            FrameExtractor(sampling_interval=0, output_format='png')
-        
-        with pytest.raises(ValueError, match="sampling_interval must be >= 1"):
-            FrameExtractor(sampling_interval=-1, output_format='png')
+            FrameExtractor(sampling_interval=bad, output_format='png')
     
-    def test_frame_extractor_init_with_invalid_output_format(self):
+    @pytest.mark.parametrize("bad_fmt", ['bmp', 'gif'])
+    def test_frame_extractor_init_with_invalid_output_format(self, bad_fmt):
         """Test that ValueError is raised for invalid output format."""
         with pytest.raises(ValueError, match="output_format must be"):
-            FrameExtractor(sampling_interval=100, output_format='bmp')
-        
-        with pytest.raises(ValueError, match="output_format must be"):
-            FrameExtractor(sampling_interval=100, output_format='gif')
+            FrameExtractor(sampling_interval=100, output_format=bad_fmt)
     
     # Test should_extract_frame
     
@@ -222,6 +205,15 @@ class TestFrameExtractor:
         assert extractor.should_extract_frame(12) is False
         assert extractor.should_extract_frame(20) is False
     
+    def test_should_extract_frame_follows_changed_interval(self):
+        """Test that changing sampling_interval after construction takes effect."""
+        extractor = FrameExtractor(sampling_interval=1, output_format='png')
+        extractor.sampling_interval = 5
+        
+        assert extractor.should_extract_frame(1) is True
+        assert extractor.should_extract_frame(2) is False
+        assert extractor.should_extract_frame(6) is True
+    
     def test_should_extract_frame_with_zero_or_negative(self):
         """Test that frames with number <= 0 are not extracted."""
         extractor = FrameExtractor(sampling_interval=100, output_format='png')
@@ -230,9 +222,19 @@ class TestFrameExtractor:
         assert extractor.should_extract_frame(-1) is False
         assert extractor.should_extract_frame(-100) is False
     
+    def test_extract_mask_matches_should_extract_frame(self):
+        """Test that extract_mask agrees with should_extract_frame frame by frame."""
+        extractor = FrameExtractor(sampling_interval=10, output_format='png')
+        
+        mask = extractor.extract_mask(35)
+        
+        assert mask.shape == (35,)
+        assert mask.tolist() == [extractor.should_extract_frame(n) for n in range(1, 36)]
+        assert extractor.extract_mask(0).size == 0
+    
     # Test save_frame
     
-    def test_save_frame_creates_camera_subdirectory(self, temp_dir):
+    def test_save_frame_creates_camera_subdirectory(self, tmp_path):
         """Test that save_frame creates camera subdirectory if it doesn't exist."""
         extractor = FrameExtractor(sampling_interval=100, output_format='png')
         
@@ -241,63 +243,63 @@ class TestFrameExtractor:
         frame[:, :] = (100, 150, 200)
         
         # Save frame
-        file_path = extractor.save_frame(frame, 1, temp_dir, 'cam0')
+        file_path = extractor.save_frame(frame, 1, tmp_path, 'cam0')
         
         # Verify subdirectory was created
-        assert (temp_dir / 'cam0').exists()
-        assert (temp_dir / 'cam0').is_dir()
+        assert (tmp_path / 'cam0').exists()
+        assert (tmp_path / 'cam0').is_dir()
         
         # Verify file was saved
         assert file_path.exists()
-        assert file_path.parent == temp_dir / 'cam0'
+        assert file_path.parent == tmp_path / 'cam0'
     
-    def test_save_frame_with_correct_filename_format(self, temp_dir):
+    def test_save_frame_with_correct_filename_format(self, tmp_path):
         """Test that save_frame uses correct filename format with zero-padding."""
         extractor = FrameExtractor(sampling_interval=100, output_format='png')
         
         frame = np.zeros((480, 640, 3), dtype=np.uint8)
         
         # Test various frame numbers
-        file_path_1 = extractor.save_frame(frame, 1, temp_dir, 'cam0')
+        file_path_1 = extractor.save_frame(frame, 1, tmp_path, 'cam0')
         assert file_path_1.name == 'frame_0001.png'
         
-        file_path_101 = extractor.save_frame(frame, 101, temp_dir, 'cam0')
+        file_path_101 = extractor.save_frame(frame, 101, tmp_path, 'cam0')
         assert file_path_101.name == 'frame_0101.png'
         
-        file_path_9999 = extractor.save_frame(frame, 9999, temp_dir, 'cam0')
+        file_path_9999 = extractor.save_frame(frame, 9999, tmp_path, 'cam0')
         assert file_path_9999.name == 'frame_9999.png'
         
-        file_path_10000 = extractor.save_frame(frame, 10000, temp_dir, 'cam0')
+        file_path_10000 = extractor.save_frame(frame, 10000, tmp_path, 'cam0')
         assert file_path_10000.name == 'frame_10000.png'
     
-    def test_save_frame_with_jpg_format(self, temp_dir):
+    def test_save_frame_with_jpg_format(self, tmp_path):
         """Test that save_frame uses correct file extension for jpg format."""
         extractor = FrameExtractor(sampling_interval=100, output_format='jpg')
         
         frame = np.zeros((480, 640, 3), dtype=np.uint8)
         
-        file_path = extractor.save_frame(frame, 1, temp_dir, 'cam0')
+        file_path = extractor.save_frame(frame, 1, tmp_path, 'cam0')
         
         assert file_path.name == 'frame_0001.jpg'
         assert file_path.suffix == '.jpg'
     
-    def test_save_frame_with_none_frame(self, temp_dir):
+    def test_save_frame_with_none_frame(self, tmp_path):
         """Test that ValueError is raised when frame is None."""
         extractor = FrameExtractor(sampling_interval=100, output_format='png')
         
         with pytest.raises(ValueError, match="Frame is None or empty"):
-            extractor.save_frame(None, 1, temp_dir, 'cam0')
+            extractor.save_frame(None, 1, tmp_path, 'cam0')
     
-    def test_save_frame_with_empty_frame(self, temp_dir):
+    def test_save_frame_with_empty_frame(self, tmp_path):
         """Test that ValueError is raised when frame is empty."""
         extractor = FrameExtractor(sampling_interval=100, output_format='png')
         
         empty_frame = np.array([])
         
         with pytest.raises(ValueError, match="Frame is None or empty"):
-            extractor.save_frame(empty_frame, 1, temp_dir, 'cam0')
+            extractor.save_frame(empty_frame, 1, tmp_path, 'cam0')
     
-    def test_save_frame_preserves_frame_content(self, temp_dir):
+    def test_save_frame_preserves_frame_content(self, tmp_path):
         """Test that saved frame preserves the original frame content."""
         extractor = FrameExtractor(sampling_interval=100, output_format='png')
         
@@ -306,10 +308,10 @@ class TestFrameExtractor:
         original_frame[:, :] = (50, 100, 150)
         
         # Save frame
-        file_path = extractor.save_frame(original_frame, 1, temp_dir, 'cam0')
+        file_path = extractor.save_frame(original_frame, 1, tmp_path, 'cam0')
         
-        # Load saved frame
-        loaded_frame = cv2.imread(str(file_path))
+        # Load saved frame from the file's bytes
+        loaded_frame = cv2.imdecode(np.fromfile(os.fspath(file_path), dtype=np.uint8), cv2.IMREAD_COLOR)
         
         # Verify content is preserved
         assert loaded_frame.shape == original_frame.shape
@@ -317,12 +319,12 @@ class TestFrameExtractor:
     
     # Test extract_frames
     
-    def test_extract_frames_from_single_frame_video(self, temp_dir, sample_video):
+    def test_extract_frames_from_single_frame_video(self, tmp_path, sample_video):
         """Test extracting frames from a single-frame video (edge case)."""
         extractor = FrameExtractor(sampling_interval=1, output_format='png')
         
         # Create a video with only 1 frame
-        video_path = temp_dir / 'single_frame.mp4'
+        video_path = tmp_path / 'single_frame.mp4'
         sample_video(video_path, frame_count=1)
         
         # Create video segment
@@ -334,7 +336,7 @@ class TestFrameExtractor:
         )
         
         # Extract frames
-        output_dir = temp_dir / 'output'
+        output_dir = tmp_path / 'output'
         extracted = extractor.extract_frames([segment], output_dir, 'cam0')
         
         # Verify exactly one frame was extracted
@@ -349,12 +351,12 @@ class TestFrameExtractor:
         loaded_frame = cv2.imread(str(extracted[0].file_path))
         assert loaded_frame is not None
     
-    def test_extract_frames_from_single_segment(self, temp_dir, sample_video):
+    def test_extract_frames_from_single_segment(self, tmp_path, sample_video):
         """Test extracting frames from a single video segment."""
         extractor = FrameExtractor(sampling_interval=1, output_format='png')
         
         # Create a video with 3 frames
-        video_path = temp_dir / 'test_video.mp4'
+        video_path = tmp_path / 'test_video.mp4'
         sample_video(video_path, frame_count=3)
         
         # Create video segment
@@ -366,7 +368,7 @@ class TestFrameExtractor:
         )
         
         # Extract frames
-        output_dir = temp_dir / 'output'
+        output_dir = tmp_path / 'output'
         extracted = extractor.extract_frames([segment], output_dir, 'cam0')
         
         # Verify all frames were extracted
@@ -380,12 +382,12 @@ class TestFrameExtractor:
             assert frame.file_path.exists()
             assert frame.camera_id == 'cam0'
     
-    def test_extract_frames_with_sampling_interval(self, temp_dir, sample_video):
+    def test_extract_frames_with_sampling_interval(self, tmp_path, sample_video):
         """Test extracting frames with sampling interval > 1."""
         extractor = FrameExtractor(sampling_interval=3, output_format='png')
         
         # Create a video with 10 frames
-        video_path = temp_dir / 'test_video.mp4'
+        video_path = tmp_path / 'test_video.mp4'
         sample_video(video_path, frame_count=10)
         
         segment = VideoSegment(
@@ -396,7 +398,7 @@ class TestFrameExtractor:
         )
         
         # Extract frames
-        output_dir = temp_dir / 'output'
+        output_dir = tmp_path / 'output'
         extracted = extractor.extract_frames([segment], output_dir, 'cam0')
         
         # Should extract frames: 1, 4, 7, 10
@@ -406,13 +408,13 @@ class TestFrameExtractor:
         assert extracted[2].global_frame_number == 7
         assert extracted[3].global_frame_number == 10
     
-    def test_extract_frames_from_multiple_segments(self, temp_dir, sample_video):
+    def test_extract_frames_from_multiple_segments(self, tmp_path, sample_video):
         """Test extracting frames from multiple video segments with continuous numbering."""
         extractor = FrameExtractor(sampling_interval=1, output_format='png')
         
         # Create two video segments
-        video1_path = temp_dir / 'video1.mp4'
-        video2_path = temp_dir / 'video2.mp4'
+        video1_path = tmp_path / 'video1.mp4'
+        video2_path = tmp_path / 'video2.mp4'
         sample_video(video1_path, frame_count=5)
         sample_video(video2_path, frame_count=3)
         
@@ -422,7 +424,7 @@ class TestFrameExtractor:
         ]
         
         # Extract frames
-        output_dir = temp_dir / 'output'
+        output_dir = tmp_path / 'output'
         extracted = extractor.extract_frames(segments, output_dir, 'cam0')
         
         # Verify continuous global frame numbering
@@ -432,35 +434,35 @@ class TestFrameExtractor:
         assert extracted[5].global_frame_number == 6  # First frame of second segment
         assert extracted[7].global_frame_number == 8  # Last frame
     
-    def test_extract_frames_directory_organization(self, temp_dir, sample_video):
+    def test_extract_frames_directory_organization(self, tmp_path, sample_video):
         """Test that extracted frames are organized in camera subdirectories."""
         extractor = FrameExtractor(sampling_interval=1, output_format='png')
         
-        video_path = temp_dir / 'test_video.mp4'
+        video_path = tmp_path / 'test_video.mp4'
         sample_video(video_path, frame_count=3)
         
         segment = VideoSegment('cam0', 1, video_path, 3)
         
         # Extract frames
-        output_dir = temp_dir / 'output'
+        output_dir = tmp_path / 'output'
         extracted = extractor.extract_frames([segment], output_dir, 'cam0')
         
         # Verify all frames are in cam0 subdirectory
         for frame in extracted:
             assert frame.file_path.parent == output_dir / 'cam0'
     
-    def test_extract_frames_with_empty_segment_list(self, temp_dir):
+    def test_extract_frames_with_empty_segment_list(self, tmp_path):
         """Test that ValueError is raised when segment list is empty."""
         extractor = FrameExtractor(sampling_interval=100, output_format='png')
         
         with pytest.raises(ValueError, match="video_segments list is empty"):
-            extractor.extract_frames([], temp_dir, 'cam0')
+            extractor.extract_frames([], tmp_path, 'cam0')
     
-    def test_extract_frames_with_progress_callback(self, temp_dir, sample_video):
+    def test_extract_frames_with_progress_callback(self, tmp_path, sample_video):
         """Test that progress callback is called during extraction."""
         extractor = FrameExtractor(sampling_interval=1, output_format='png')
         
-        video_path = temp_dir / 'test_video.mp4'
+        video_path = tmp_path / 'test_video.mp4'
         sample_video(video_path, frame_count=5)
         
         segment = VideoSegment('cam0', 1, video_path, 5)
@@ -471,7 +473,7 @@ class TestFrameExtractor:
             progress_calls.append((current, total))
         
         # Extract frames
-        output_dir = temp_dir / 'output'
+        output_dir = tmp_path / 'output'
         extractor.extract_frames([segment], output_dir, 'cam0', progress_callback)
         
         # Verify callback was called
@@ -479,55 +481,151 @@ class TestFrameExtractor:
         assert progress_calls[0] == (1, 5)
         assert progress_calls[4] == (5, 5)
     
-    def test_extract_frames_handles_corrupted_video(self, temp_dir):
+    def test_extract_frames_handles_corrupted_video(self, tmp_path):
         """Test that extraction continues when a video file cannot be opened."""
         extractor = FrameExtractor(sampling_interval=1, output_format='png')
         
         # Create a fake video file (not a real video)
-        fake_video = temp_dir / 'fake_video.mp4'
+        fake_video = tmp_path / 'fake_video.mp4'
         fake_video.write_text("This is not a video")
         
         segment = VideoSegment('cam0', 1, fake_video, 10)
         
         # Extract frames (should handle error gracefully)
-        output_dir = temp_dir / 'output'
+        output_dir = tmp_path / 'output'
         extracted = extractor.extract_frames([segment], output_dir, 'cam0')
         
         # Should return empty list since video couldn't be opened
         assert len(extracted) == 0
     
-    def test_extract_frames_preserves_resolution(self, temp_dir, sample_video):
+    def test_extract_frames_preserves_resolution(self, tmp_path, sample_video):
         """Test that extracted frames preserve the original video resolution."""
         extractor = FrameExtractor(sampling_interval=1, output_format='png')
         
         # Create video with specific resolution
-        video_path = temp_dir / 'test_video.mp4'
+        video_path = tmp_path / 'test_video.mp4'
         sample_video(video_path, frame_count=2, width=320, height=240)
         
         segment = VideoSegment('cam0', 1, video_path, 2)
         
         # Extract frames
-        output_dir = temp_dir / 'output'
+        output_dir = tmp_path / 'output'
         extracted = extractor.extract_frames([segment], output_dir, 'cam0')
         
         # Load first extracted frame and check resolution
         loaded_frame = cv2.imread(str(extracted[0].file_path))
         assert loaded_frame.shape[0] == 240  # height
         assert loaded_frame.shape[1] == 320  # width
+    
+    def test_extract_frames_attributes_save_errors_to_their_frame(self, tmp_path, sample_video,
+                                                                  monkeypatch):
+        """Test that failed saves and callbacks are logged against the frame they belong to."""
+        extractor = FrameExtractor(sampling_interval=1, output_format='png')
+        
+        video_path = tmp_path / 'test_video.mp4'
+        sample_video(video_path, frame_count=5, width=64, height=48)
+        segment = VideoSegment('cam0', 1, video_path, 5)
+        
+        real_save_frame = FrameExtractor.save_frame
+        
+        def failing_save_frame(self, frame, global_frame_number, output_dir, camera_id):
+            if global_frame_number == 2:
+                raise IOError("disk full")
+            return real_save_frame(self, frame, global_frame_number, output_dir, camera_id)
+        
+        def failing_callback(done, total):
+            if done == 3:
+                raise RuntimeError("callback failed")
+        
+        logged = []
+        monkeypatch.setattr(FrameExtractor, 'save_frame', failing_save_frame)
+        monkeypatch.setattr('src.frame_extraction.log_error',
+                            lambda error, *args: logged.append(error))
+        
+        extracted = extractor.extract_frames([segment], tmp_path / 'output', 'cam0',
+                                             progress_callback=failing_callback)
+        
+        # Frame 2's save failed; frame 4 was saved but its progress report failed
+        assert [f.global_frame_number for f in extracted] == [1, 3, 4, 5]
+        assert [(e.frame_number, type(e).__name__) for e in logged] == [
+            (2, 'FrameExtractionError'), (4, 'FrameExtractionError')
+        ]
+        assert 'disk full' in logged[0].reason
+        assert 'callback failed' in logged[1].reason
 
 
 # Property-Based Tests
 
 from hypothesis import given, strategies as st, assume, settings
 from hypothesis import HealthCheck
+from unittest import mock
+
+import src.frame_extraction as frame_extraction_module
+
+
+# Expected name of a saved frame: frame_XXXX.ext, zero-padded to at least 4 digits
+_FRAME_NAME_RE = re.compile(r'^frame_(\d{4,})\.(png|jpg|jpeg)$')
+
+
+# Single tiny frame reused for every synthetic frame where pixels don't matter
+_SHARED_ZEROS = np.zeros((8, 8, 3), dtype=np.uint8)
+
+# Resolutions for the resolution-preservation property: common sizes plus
+# non-16-aligned ones. A fixed set lets encoded_video reuse its encodes
+# across examples instead of opening a VideoWriter for each one.
+_RESOLUTIONS = st.sampled_from([
+    (160, 120), (176, 144), (322, 242), (640, 480), (854, 482), (1280, 720), (1920, 1080)
+])
+
+
+def _fake_video_capture(videos):
+    """Build a cv2.VideoCapture stand-in serving synthetic frames.
+    
+    Args:
+        videos: Mapping of str(video path) to (frame_count, frame); every
+            frame of a video is the same array
+    """
+    class _FakeVideoCapture:
+        def __init__(self, path):
+            self._opened = path in videos
+            self._frame_count, self._frame = videos.get(path, (0, None))
+            self._position = 0
+        
+        def isOpened(self):
+            return self._opened
+        
+        def grab(self):
+            if self._position >= self._frame_count:
+                return False
+            self._position += 1
+            return True
+        
+        def retrieve(self):
+            return True, self._frame
+        
+        def get(self, prop_id):
+            if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+                return float(self._frame_count)
+            return 0.0
+        
+        def set(self, prop_id, value):
+            return False
+        
+        def release(self):
+            pass
+    
+    return _FakeVideoCapture
 
 
 class TestFrameExtractionProperties:
     """Property-based tests for frame extraction components."""
     
+    # The pattern is algebraic in (interval, total), so a modest budget over
+    # short videos covers it
+    @settings(max_examples=25)
     @given(
         sampling_interval=st.integers(min_value=1, max_value=1000),
-        total_frames=st.integers(min_value=1, max_value=10000)
+        total_frames=st.integers(min_value=1, max_value=500)
     )
     def test_property_frame_sampling_pattern(self, sampling_interval, total_frames):
         """Property 3: Frame Sampling Pattern
@@ -548,10 +646,7 @@ class TestFrameExtractionProperties:
             frame_num += sampling_interval
         
         # Test which frames should be extracted
-        actual_frames = []
-        for frame_num in range(1, total_frames + 1):
-            if extractor.should_extract_frame(frame_num):
-                actual_frames.append(frame_num)
+        actual_frames = (np.flatnonzero(extractor.extract_mask(total_frames)) + 1).tolist()
         
         # Verify the pattern matches
         assert actual_frames == expected_frames, \
@@ -583,16 +678,17 @@ class TestFrameExtractionProperties:
                 f"Next frame {next_frame} should exceed total frames {total_frames}"
 
     
-    @settings(deadline=None, max_examples=50)
+    @settings(deadline=None, max_examples=15, suppress_health_check=[HealthCheck.too_slow])
     @given(
         segment_frame_counts=st.lists(
-            st.integers(min_value=1, max_value=100),
+            st.integers(min_value=1, max_value=20),
             min_size=1,
-            max_size=5
+            max_size=3
         ),
         sampling_interval=st.integers(min_value=1, max_value=50)
     )
-    def test_property_global_frame_numbering(self, segment_frame_counts, sampling_interval):
+    def test_property_global_frame_numbering(self, tmp_path_factory, segment_frame_counts,
+                                             sampling_interval):
         """Property 4: Global Frame Numbering Continuity
         
         **Validates: Requirements 3.2, 3.3, 3.5**
@@ -603,24 +699,16 @@ class TestFrameExtractionProperties:
         """
         extractor = FrameExtractor(sampling_interval=sampling_interval, output_format='png')
         
-        # Create temporary directory for this test
-        temp_dir = Path(tempfile.mkdtemp())
-        
-        # Helper function to create test videos
-        def create_test_video(path: Path, frame_count: int):
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(str(path), fourcc, 30.0, (320, 240))
-            for i in range(frame_count):
-                frame = np.zeros((240, 320, 3), dtype=np.uint8)
-                frame[:, :] = (i * 10 % 256, (i * 20) % 256, (i * 30) % 256)
-                out.write(frame)
-            out.release()
+        # Only numbering is under test, so segments are served by a fake
+        # capture and saving just records the would-be path
+        temp_dir = tmp_path_factory.mktemp("numbering")
+        videos = {}
         
         # Create video segments
         segments = []
         for idx, frame_count in enumerate(segment_frame_counts):
             video_path = temp_dir / f'segment_{idx}.mp4'
-            create_test_video(video_path, frame_count)
+            videos[str(video_path)] = (frame_count, _SHARED_ZEROS)
             
             segment = VideoSegment(
                 camera_id='cam0',
@@ -632,19 +720,17 @@ class TestFrameExtractionProperties:
         
         # Extract frames
         output_dir = temp_dir / 'output'
-        extracted = extractor.extract_frames(segments, output_dir, 'cam0')
+        with mock.patch.object(frame_extraction_module.cv2, 'VideoCapture',
+                               _fake_video_capture(videos)), \
+                mock.patch.object(extractor, 'save_frame',
+                                  side_effect=lambda frame, n, out_dir, cam: out_dir / f'frame_{n:04d}.png'):
+            extracted = extractor.extract_frames(segments, output_dir, 'cam0')
         
         # Verify global frame numbering continuity
-        # Calculate expected global frame numbers
-        expected_global_frames = []
-        cumulative_frames = 0
-        
-        for segment_idx, frame_count in enumerate(segment_frame_counts):
-            for local_frame in range(1, frame_count + 1):
-                global_frame = cumulative_frames + local_frame
-                if extractor.should_extract_frame(global_frame):
-                    expected_global_frames.append(global_frame)
-            cumulative_frames += frame_count
+        # Calculate expected global frame numbers: segments number their frames
+        # consecutively, so the sampled frames of the concatenation are expected
+        all_frames = np.arange(1, sum(segment_frame_counts) + 1)
+        expected_global_frames = all_frames[(all_frames - 1) % sampling_interval == 0].tolist()
         
         # Extract actual global frame numbers from results
         actual_global_frames = [frame.global_frame_number for frame in extracted]
@@ -677,16 +763,13 @@ class TestFrameExtractionProperties:
                 assert spacing == sampling_interval, \
                     f"Spacing between frames {actual_global_frames[i-1]} and {actual_global_frames[i]} " \
                     f"is {spacing}, expected {sampling_interval}"
-        
-        # Cleanup
-        shutil.rmtree(temp_dir)
 
     
     @given(
         global_frame_number=st.integers(min_value=1, max_value=999999),
         output_format=st.sampled_from(['png', 'jpg', 'jpeg'])
     )
-    def test_property_filename_format(self, global_frame_number, output_format):
+    def test_property_filename_format(self, tmp_path_factory, global_frame_number, output_format):
         """Property 5: Filename Format Consistency
         
         **Validates: Requirements 2.4, 3.4, 4.4, 8.4**
@@ -698,70 +781,60 @@ class TestFrameExtractionProperties:
         extractor = FrameExtractor(sampling_interval=100, output_format=output_format)
         
         # Create temporary directory
-        temp_dir = Path(tempfile.mkdtemp())
+        temp_dir = tmp_path_factory.mktemp("filename")
         
-        try:
-            # Create a test frame
-            frame = np.zeros((100, 100, 3), dtype=np.uint8)
-            frame[:, :] = (100, 150, 200)
-            
-            # Save the frame
-            file_path = extractor.save_frame(frame, global_frame_number, temp_dir, 'cam0')
-            
-            # Extract filename
-            filename = file_path.name
-            
-            # Verify filename pattern
-            # Pattern: frame_XXXX.ext where XXXX is zero-padded to at least 4 digits
-            import re
-            
-            # Normalize output format for comparison
-            expected_ext = output_format.lower()
-            
-            # Check pattern
-            pattern = r'^frame_(\d{4,})\.(png|jpg|jpeg)$'
-            match = re.match(pattern, filename)
-            
-            assert match is not None, \
-                f"Filename '{filename}' does not match pattern 'frame_XXXX.ext'"
-            
-            # Extract the number part
-            number_str = match.group(1)
-            file_ext = match.group(2)
-            
-            # Verify the number matches the global frame number
-            extracted_number = int(number_str)
-            assert extracted_number == global_frame_number, \
-                f"Filename contains {extracted_number}, expected {global_frame_number}"
-            
-            # Verify zero-padding (at least 4 digits)
-            assert len(number_str) >= 4, \
-                f"Frame number '{number_str}' should be zero-padded to at least 4 digits"
-            
-            # Verify correct zero-padding
-            expected_padding = max(4, len(str(global_frame_number)))
-            assert len(number_str) == expected_padding, \
-                f"Frame number '{number_str}' has incorrect padding length"
-            
-            # Verify file extension matches output format
-            assert file_ext == expected_ext, \
-                f"File extension '{file_ext}' does not match expected '{expected_ext}'"
-            
-            # Verify the file actually exists
-            assert file_path.exists(), f"File {file_path} does not exist"
-            
-        finally:
-            # Cleanup
-            shutil.rmtree(temp_dir)
+        # Create a test frame
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        frame[:, :] = (100, 150, 200)
+        
+        # Save the frame
+        file_path = extractor.save_frame(frame, global_frame_number, temp_dir, 'cam0')
+        
+        # Extract filename
+        filename = file_path.name
+        
+        # Normalize output format for comparison
+        expected_ext = output_format.lower()
+        
+        # Verify filename pattern
+        match = _FRAME_NAME_RE.match(filename)
+        
+        assert match is not None, \
+            f"Filename '{filename}' does not match pattern 'frame_XXXX.ext'"
+        
+        # Extract the number part
+        number_str = match.group(1)
+        file_ext = match.group(2)
+        
+        # Verify the number matches the global frame number
+        extracted_number = int(number_str)
+        assert extracted_number == global_frame_number, \
+            f"Filename contains {extracted_number}, expected {global_frame_number}"
+        
+        # Verify zero-padding (at least 4 digits)
+        assert len(number_str) >= 4, \
+            f"Frame number '{number_str}' should be zero-padded to at least 4 digits"
+        
+        # Verify correct zero-padding
+        expected_padding = max(4, len(str(global_frame_number)))
+        assert len(number_str) == expected_padding, \
+            f"Frame number '{number_str}' has incorrect padding length"
+        
+        # Verify file extension matches output format
+        assert file_ext == expected_ext, \
+            f"File extension '{file_ext}' does not match expected '{expected_ext}'"
+        
+        # Verify the file actually exists
+        assert file_path.exists(), f"File {file_path} does not exist"
 
     
     @settings(deadline=None, max_examples=30)
     @given(
-        width=st.integers(min_value=160, max_value=1920),
-        height=st.integers(min_value=120, max_value=1080),
-        frame_count=st.integers(min_value=1, max_value=10)
+        resolution=_RESOLUTIONS,
+        frame_count=st.sampled_from([1, 4])
     )
-    def test_property_resolution_preservation(self, width, height, frame_count):
+    def test_property_resolution_preservation(self, tmp_path_factory, encoded_video, resolution,
+                                              frame_count):
         """Property 7: Frame Resolution Preservation
         
         **Validates: Requirements 2.5**
@@ -769,65 +842,47 @@ class TestFrameExtractionProperties:
         For any frame extracted from a video, the extracted frame's dimensions 
         should match the original video's frame dimensions.
         """
-        # Ensure width and height are even (required by some video codecs)
-        width = width if width % 2 == 0 else width + 1
-        height = height if height % 2 == 0 else height + 1
+        width, height = resolution
         
+        # A fresh extractor per example; it remembers every directory it created
         extractor = FrameExtractor(sampling_interval=1, output_format='png')
         
-        # Create temporary directory
-        temp_dir = Path(tempfile.mkdtemp())
+        # A real encode, so the decoded frame size comes from OpenCV
+        temp_dir = tmp_path_factory.mktemp("resolution")
+        video_path = encoded_video(frame_count, width, height)
         
-        try:
-            # Create a test video with specific resolution
-            video_path = temp_dir / 'test_video.mp4'
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(str(video_path), fourcc, 30.0, (width, height))
-            
-            for i in range(frame_count):
-                frame = np.zeros((height, width, 3), dtype=np.uint8)
-                # Create a pattern to verify it's the right frame
-                frame[:, :] = (i * 10 % 256, (i * 20) % 256, (i * 30) % 256)
-                out.write(frame)
+        # Create video segment
+        segment = VideoSegment(
+            camera_id='cam0',
+            segment_number=1,
+            file_path=video_path,
+            frame_count=frame_count
+        )
+        
+        # Extract frames
+        output_dir = temp_dir / 'output'
+        extracted = extractor.extract_frames([segment], output_dir, 'cam0')
+        
+        # Verify all extracted frames have the correct resolution
+        assert len(extracted) == frame_count, \
+            f"Expected {frame_count} frames, got {len(extracted)}"
+        
+        for frame_info in extracted:
+            # Load the extracted frame
+            loaded_frame = cv2.imread(str(frame_info.file_path))
             
-            out.release()
+            assert loaded_frame is not None, \
+                f"Failed to load frame {frame_info.file_path}"
             
-            # Create video segment
-            segment = VideoSegment(
-                camera_id='cam0',
-                segment_number=1,
-                file_path=video_path,
-                frame_count=frame_count
-            )
+            # Check dimensions
+            actual_height, actual_width = loaded_frame.shape[:2]
             
-            # Extract frames
-            output_dir = temp_dir / 'output'
-            extracted = extractor.extract_frames([segment], output_dir, 'cam0')
+            assert actual_width == width, \
+                f"Frame {frame_info.global_frame_number}: width {actual_width} != expected {width}"
             
-            # Verify all extracted frames have the correct resolution
-            assert len(extracted) == frame_count, \
-                f"Expected {frame_count} frames, got {len(extracted)}"
+            assert actual_height == height, \
+                f"Frame {frame_info.global_frame_number}: height {actual_height} != expected {height}"
             
-            for frame_info in extracted:
-                # Load the extracted frame
-                loaded_frame = cv2.imread(str(frame_info.file_path))
-                
-                assert loaded_frame is not None, \
-                    f"Failed to load frame {frame_info.file_path}"
-                
-                # Check dimensions
-                actual_height, actual_width = loaded_frame.shape[:2]
-                
-                assert actual_width == width, \
-                    f"Frame {frame_info.global_frame_number}: width {actual_width} != expected {width}"
-                
-                assert actual_height == height, \
-                    f"Frame {frame_info.global_frame_number}: height {actual_height} != expected {height}"
-                
-                # Verify it's a color image (3 channels)
-                assert loaded_frame.shape[2] == 3, \
-                    f"Frame {frame_info.global_frame_number}: expected 3 channels, got {loaded_frame.shape[2]}"
-        
-        finally:
-            # Cleanup
-            shutil.rmtree(temp_dir)
+            # Verify it's a color image (3 channels)
+            assert loaded_frame.shape[2] == 3, \
+                f"Frame {frame_info.global_frame_number}: expected 3 channels, got {loaded_frame.shape[2]}"
@@ -1,5 +1,7 @@
 """Integration tests for the complete video frame stitcher pipeline."""
 
+import functools
+import os
 import pytest
 import tempfile
 import shutil
@@ -12,25 +14,61 @@ from src.main import main
 from src.config import Config, ConfigManager
 
 
-def create_test_video(path: Path, num_frames: int, width: int = 640, height: int = 480, color=(0, 0, 255)):
-    """Create a test video file with specified parameters."""
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(str(path), fourcc, 30.0, (width, height))
+@pytest.fixture(scope="session")
+def create_test_video(tmp_path_factory):
+    """Return a helper that places a test video at a given path.
     
-    for i in range(num_frames):
-        # Create a frame with the specified color and frame number text
-        frame = np.full((height, width, 3), color, dtype=np.uint8)
-        cv2.putText(frame, f"Frame {i+1}", (50, height//2), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        out.write(frame)
+    Videos depend only on their parameters, so each combination is encoded
+    once per session and hard-linked (or copied, across filesystems) to
+    later paths.
+    """
+    cache_dir = tmp_path_factory.mktemp("videos")
     
-    out.release()
+    @functools.lru_cache(maxsize=None)
+    def _encode_test_video(num_frames: int, width: int, height: int, color) -> Path:
+        """Encode a test video once per parameter set and return its cached path."""
+        path = cache_dir / f"video_{num_frames}_{width}x{height}_{'_'.join(map(str, color))}.mp4"
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        out = cv2.VideoWriter(str(path), fourcc, 30.0, (width, height))
+        
+        # Reset one buffer from a solid-color template for every frame;
+        # VideoWriter.write copies the pixels, so reusing the buffer is safe
+        template = np.empty((height, width, 3), dtype=np.uint8)
+        template[...] = color
+        frame = np.empty_like(template)
+        
+        for i in range(num_frames):
+            # Fill the frame with the specified color and frame number text
+            np.copyto(frame, template)
+            cv2.putText(frame, f"Frame {i+1}", (50, height//2), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            out.write(frame)
+        
+        out.release()
+        return path
+    
+    def _create_test_video(path: Path, num_frames: int, width: int = 640, height: int = 480,
+                           color=(0, 0, 255)):
+        """Create a test video file with specified parameters."""
+        cached = _encode_test_video(num_frames, width, height, tuple(color))
+        try:
+            os.link(cached, path)
+        except OSError:
+            shutil.copyfile(cached, path)
+    
+    return _create_test_video
+
+
+def count_frames(directory: Path) -> int:
+    """Count stitched frame_*.png files in directory with a single scan."""
+    return sum(1 for entry in os.scandir(directory)
+               if entry.name.startswith('frame_') and entry.name.endswith('.png'))
 
 
 class TestEndToEndPipeline:
     """Test the complete pipeline from video discovery to frame stitching."""
     
-    def test_pipeline_with_single_segment(self):
+    def test_pipeline_with_single_segment(self, create_test_video):
         """Test end-to-end pipeline with single video segment per camera."""
         with tempfile.TemporaryDirectory() as tmpdir:
             base = Path(tmpdir)
@@ -83,12 +121,8 @@ class TestEndToEndPipeline:
                     # Height should be double (two frames stacked)
                     assert img.height == 480 * 2
                     assert img.width == 640
-            
-            # Give Windows time to release file handles
-            import time
-            time.sleep(0.1)
     
-    def test_pipeline_with_multiple_segments(self):
+    def test_pipeline_with_multiple_segments(self, create_test_video):
         """Test end-to-end pipeline with multiple video segments."""
         with tempfile.TemporaryDirectory() as tmpdir:
             base = Path(tmpdir)
@@ -121,12 +155,8 @@ class TestEndToEndPipeline:
                 cam1_pattern='stereo_cam1_sbs_*.mp4'
             )
             
-            config_path = base / "config.yaml"
-            config_manager = ConfigManager()
-            config_manager.save_config(config, config_path)
-            
             # Run main pipeline
-            exit_code = main(config_path)
+            exit_code = main(config)
             
             # Verify success
             assert exit_code == 0
@@ -136,10 +166,10 @@ class TestEndToEndPipeline:
             # Total frames: 300
             # Frames extracted at positions: 1, 101, 201
             # Check that we have the expected number of frames
-            stitched_files = list(output_dir.glob("frame_*.png"))
-            assert len(stitched_files) == 3, f"Expected 3 stitched frames, got {len(stitched_files)}"
+            stitched_count = count_frames(output_dir)
+            assert stitched_count == 3, f"Expected 3 stitched frames, got {stitched_count}"
     
-    def test_pipeline_with_mismatched_segments(self):
+    def test_pipeline_with_mismatched_segments(self, create_test_video):
         """Test pipeline behavior with missing segment pairs."""
         with tempfile.TemporaryDirectory() as tmpdir:
             base = Path(tmpdir)
@@ -171,22 +201,17 @@ class TestEndToEndPipeline:
                 cam1_pattern='stereo_cam1_sbs_*.mp4'
             )
             
-            config_path = base / "config.yaml"
-            config_manager = ConfigManager()
-            config_manager.save_config(config, config_path)
-            
             # Run main pipeline - should still succeed but with warnings
-            exit_code = main(config_path)
+            exit_code = main(config)
             
             # Should succeed (processes available segments)
             assert exit_code == 0
             
             # Should have stitched frames from segment 1 only
             assert output_dir.exists()
-            stitched_files = list(output_dir.glob("frame_*.png"))
-            assert len(stitched_files) > 0
+            assert count_frames(output_dir) > 0
     
-    def test_pipeline_with_different_sampling_intervals(self):
+    def test_pipeline_with_different_sampling_intervals(self, create_test_video):
         """Test pipeline with various sampling intervals."""
         sampling_intervals = [1, 10, 50]
         
@@ -219,12 +244,8 @@ class TestEndToEndPipeline:
                     cam1_pattern='stereo_cam1_sbs_*.mp4'
                 )
                 
-                config_path = base / "config.yaml"
-                config_manager = ConfigManager()
-                config_manager.save_config(config, config_path)
-                
                 # Run main pipeline
-                exit_code = main(config_path)
+                exit_code = main(config)
                 
                 # Verify success
                 assert exit_code == 0
@@ -233,9 +254,9 @@ class TestEndToEndPipeline:
                 # Frames at positions: 1, 1+interval, 1+2*interval, ...
                 expected_count = len([i for i in range(1, num_frames + 1, interval)])
                 
-                stitched_files = list(output_dir.glob("frame_*.png"))
-                assert len(stitched_files) == expected_count, \
-                    f"Expected {expected_count} frames with interval {interval}, got {len(stitched_files)}"
+                stitched_count = count_frames(output_dir)
+                assert stitched_count == expected_count, \
+                    f"Expected {expected_count} frames with interval {interval}, got {stitched_count}"
 
 
 class TestErrorHandling:
@@ -257,12 +278,8 @@ class TestErrorHandling:
                 cam1_pattern='stereo_cam1_sbs_*.mp4'
             )
             
-            config_path = base / "config.yaml"
-            config_manager = ConfigManager()
-            config_manager.save_config(config, config_path)
-            
             # Run main pipeline - should fail
-            exit_code = main(config_path)
+            exit_code = main(config)
             
             assert exit_code != 0
     
@@ -290,16 +307,12 @@ class TestErrorHandling:
                 cam1_pattern='stereo_cam1_sbs_*.mp4'
             )
             
-            config_path = base / "config.yaml"
-            config_manager = ConfigManager()
-            config_manager.save_config(config, config_path)
-            
             # Run main pipeline - should fail
-            exit_code = main(config_path)
+            exit_code = main(config)
             
             assert exit_code != 0
     
-    def test_only_one_camera_videos(self):
+    def test_only_one_camera_videos(self, create_test_video):
         """Test error handling when only one camera has videos."""
         with tempfile.TemporaryDirectory() as tmpdir:
             base = Path(tmpdir)
@@ -325,11 +338,7 @@ class TestErrorHandling:
                 cam1_pattern='stereo_cam1_sbs_*.mp4'
             )
             
-            config_path = base / "config.yaml"
-            config_manager = ConfigManager()
-            config_manager.save_config(config, config_path)
-            
             # Run main pipeline - should fail (can't stitch without both cameras)
-            exit_code = main(config_path)
+            exit_code = main(config)
             
             assert exit_code != 0
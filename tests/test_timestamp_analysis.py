@@ -0,0 +1,108 @@
+"""Unit tests for timestamp synchronization analysis."""
+
+import pytest
+
+from src.config import Config
+from src.report_generator import generate_enhanced_report
+from src.timestamp_analysis import TimestampAnalyzer
+
+
+# Five frames per camera at 25 fps; cam1 starts 5ms late and drifts further
+_CAM0_US = [10_000_000, 10_040_000, 10_080_000, 10_120_000, 10_160_000]
+_CAM1_US = [10_005_000, 10_045_000, 10_083_000, 10_130_000, 10_172_000]
+
+# (frame_idx, cam0_time_s, cam1_time_s, drift_ms) worked out by hand: times are
+# relative to each camera's first frame, drift is (cam0 - cam1) / 1000
+_EXPECTED_SAMPLE_DRIFTS = [
+    (0, 0.0, 0.0, -5.0),
+    (1, 0.04, 0.04, -5.0),
+    (2, 0.08, 0.078, -3.0),
+    (3, 0.12, 0.125, -10.0),
+    (4, 0.16, 0.167, -12.0),
+]
+
+
+def _timestamps(pts_us_list):
+    """Build timestamp records as read from a *_timestamps.jsonl file."""
+    return [
+        {'i': i, 'pts_us': pts_us, 'pts_ms': pts_us / 1000}
+        for i, pts_us in enumerate(pts_us_list)
+    ]
+
+
+@pytest.fixture
+def sync_analysis():
+    """SyncAnalysis for the hand-computed five-frame recording."""
+    analyzer = TimestampAnalyzer(sample_points=20)
+    return analyzer.analyze_sync_quality(_timestamps(_CAM0_US), _timestamps(_CAM1_US))
+
+
+class TestSyncAnalysis:
+    """Test suite for SyncAnalysis sample points."""
+
+    def test_sample_drifts_match_hand_computed_values(self, sync_analysis):
+        """Test that sample_drifts pairs each sample index with relative times and drift."""
+        assert sync_analysis.sample_indices == [0, 1, 2, 3, 4]
+        assert sync_analysis.sample_drifts == [
+            pytest.approx(expected) for expected in _EXPECTED_SAMPLE_DRIFTS
+        ]
+
+    def test_sample_drifts_is_built_once(self, sync_analysis):
+        """Test that sample_drifts is cached after the first access."""
+        assert sync_analysis.sample_drifts is sync_analysis.sample_drifts
+
+    def test_sample_drifts_follow_subsampled_indices(self):
+        """Test that only the evenly spaced sample frames are reported."""
+        cam0_us = [i * 40_000 for i in range(50)]
+        cam1_us = [i * 40_000 + 2_000 for i in range(50)]
+        analyzer = TimestampAnalyzer(sample_points=5)
+
+        analysis = analyzer.analyze_sync_quality(_timestamps(cam0_us), _timestamps(cam1_us))
+
+        assert [sample[0] for sample in analysis.sample_drifts] == [0, 10, 20, 30, 40]
+        assert analysis.sample_drifts[2] == pytest.approx((20, 0.8, 0.8, -2.0))
+
+
+class TestEnhancedReport:
+    """Test suite for the sample table of the detailed report."""
+
+    def test_report_renders_sample_table(self, tmp_path, sync_analysis):
+        """Test that every sample point is rendered as a row of the detail table."""
+        config = Config(
+            input_dir=tmp_path / "segments",
+            output_dir=tmp_path / "stitched",
+            extracted_frames_dir=tmp_path / "extracted",
+            sampling_interval=1,
+            output_format='png',
+            cam0_pattern='stereo_cam0_sbs_*.mp4',
+            cam1_pattern='stereo_cam1_sbs_*.mp4'
+        )
+        report_path = tmp_path / "report.txt"
+
+        generate_enhanced_report(
+            output_path=report_path,
+            cam0_total_frames=5,
+            cam1_total_frames=5,
+            cam0_segments=1,
+            cam1_segments=1,
+            cam0_extracted=5,
+            cam1_extracted=5,
+            frames_stitched=5,
+            frame_difference=0,
+            difference_percent=0.0,
+            sampling_interval=1,
+            config=config,
+            sync_analysis=sync_analysis
+        )
+
+        report = report_path.read_text(encoding='utf-8')
+        rows = [
+            "       0       0.000s       0.000s      -5.00ms  ✅",
+            "       1       0.040s       0.040s      -5.00ms  ✅",
+            "       2       0.080s       0.078s      -3.00ms  ✅",
+            "       3       0.120s       0.125s     -10.00ms  ⚠️",
+            "       4       0.160s       0.167s     -12.00ms  ⚠️",
+        ]
+        positions = [report.index(row) for row in rows]
+        assert positions == sorted(positions)
+        assert "显示前10个采样点" not in report
@@ -1,38 +1,41 @@
 """Unit tests for VideoDiscovery class."""
 
+import functools
+import json
 import pytest
 from pathlib import Path
-import tempfile
 import shutil
+import subprocess
 import cv2
 import numpy as np
 from hypothesis import given, strategies as st, settings
+import src.video_discovery as video_discovery
 from src.video_discovery import VideoDiscovery, VideoSegment
 
 
+_FOURCC_MP4V = cv2.VideoWriter_fourcc(*'mp4v')
+
+
 class TestVideoDiscovery:
     """Test suite for VideoDiscovery class."""
     
     @pytest.fixture
-    def temp_dir(self):
-        """Create a temporary directory for test files."""
-        temp_path = Path(tempfile.mkdtemp())
-        yield temp_path
-        # Cleanup after test
-        shutil.rmtree(temp_path)
+    def temp_dir(self, tmp_path):
+        """Create a temporary directory for test files (cleaned up by pytest)."""
+        return tmp_path
     
     @pytest.fixture
     def sample_video(self):
         """Create a sample video file for testing."""
         def _create_video(path: Path, frame_count: int = 10, width: int = 640, height: int = 480):
             """Create a simple test video with specified frame count."""
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(str(path), fourcc, 30.0, (width, height))
+            out = cv2.VideoWriter(str(path), _FOURCC_MP4V, 30.0, (width, height))
             
+            # Refill one buffer per frame instead of zeroing a new one
+            frame = np.empty((height, width, 3), dtype=np.uint8)
             for i in range(frame_count):
                 # Create a simple frame with a different color for each frame
-                frame = np.zeros((height, width, 3), dtype=np.uint8)
-                frame[:, :] = (i * 10 % 256, (i * 20) % 256, (i * 30) % 256)
+                frame[:] = (i * 10 % 256, (i * 20) % 256, (i * 30) % 256)
                 out.write(frame)
             
             out.release()
@@ -167,6 +170,29 @@ class TestVideoDiscovery:
         assert len(result['cam0']) == 1
         assert result['cam0'][0].file_path.suffix == '.avi'
     
+    def test_discover_videos_with_subdirectory_patterns(self, temp_dir, sample_video, monkeypatch):
+        """Test that patterns with a directory component match inside that directory."""
+        (temp_dir / "cam0").mkdir()
+        (temp_dir / "cam1").mkdir()
+        sample_video(temp_dir / "cam0" / "seg_0002.mp4", frame_count=5)
+        sample_video(temp_dir / "cam0" / "seg_0001.mp4", frame_count=6)
+        sample_video(temp_dir / "cam1" / "seg_0001.mp4", frame_count=7)
+        # Same name at the top level must not match
+        sample_video(temp_dir / "seg_0003.mp4", frame_count=8)
+        
+        monkeypatch.setattr(video_discovery, '_FRAME_COUNT_CACHE', {})
+        result = VideoDiscovery.discover_videos(temp_dir, "cam0/seg_*.mp4", "cam1/seg_*.mp4")
+        
+        assert [(s.segment_number, s.frame_count) for s in result['cam0']] == [(1, 6), (2, 5)]
+        assert [(s.segment_number, s.frame_count) for s in result['cam1']] == [(1, 7)]
+        assert result['cam0'][0].file_path == temp_dir / "cam0" / "seg_0001.mp4"
+        
+        # The frame count sidecar keeps the subdirectory, so a rerun is served from it
+        monkeypatch.setattr(video_discovery, '_FRAME_COUNT_CACHE', {})
+        monkeypatch.setattr(video_discovery, '_FFPROBE', None)
+        monkeypatch.setattr(video_discovery.cv2, 'VideoCapture', None)
+        assert VideoDiscovery.discover_videos(temp_dir, "cam0/seg_*.mp4", "cam1/seg_*.mp4") == result
+    
     def test_get_frame_count_with_valid_video(self, temp_dir, sample_video):
         """Test getting frame count from a valid video file."""
         video_path = temp_dir / "test_video.mp4"
@@ -193,6 +219,116 @@ class TestVideoDiscovery:
         
         assert frame_count == 0
     
+    def test_get_frame_count_uses_cache_for_unchanged_file(self, temp_dir, sample_video, monkeypatch):
+        """Test that a second lookup of an unchanged video does not reopen it."""
+        video_path = temp_dir / "test_video.mp4"
+        sample_video(video_path, frame_count=12)
+        
+        opened = []
+        real_capture = cv2.VideoCapture
+        
+        def counting_capture(*args):
+            opened.append(args)
+            return real_capture(*args)
+        
+        monkeypatch.setattr(video_discovery, '_FRAME_COUNT_CACHE', {})
+        monkeypatch.setattr(video_discovery, '_FFPROBE', None)
+        monkeypatch.setattr(video_discovery.cv2, 'VideoCapture', counting_capture)
+        
+        assert VideoDiscovery.get_frame_count(video_path) == 12
+        assert VideoDiscovery.get_frame_count(video_path) == 12
+        assert len(opened) == 1
+    
+    def test_get_frame_count_skips_files_too_small_to_be_videos(self, temp_dir, monkeypatch):
+        """Test that empty and tiny files return 0 without being probed."""
+        def failing_capture(*args):
+            raise AssertionError("tiny file was probed")
+        
+        monkeypatch.setattr(video_discovery, '_FFPROBE', None)
+        monkeypatch.setattr(video_discovery.cv2, 'VideoCapture', failing_capture)
+        
+        empty_video = temp_dir / "empty.mp4"
+        empty_video.write_bytes(b'')
+        junk_video = temp_dir / "junk.mp4"
+        junk_video.write_text("This is not a video file")
+        
+        assert VideoDiscovery.get_frame_count(empty_video) == 0
+        assert VideoDiscovery.get_frame_count(junk_video) == 0
+    
+    @pytest.mark.parametrize("ffprobe_output,expected", [(b"37\n", 37), (b"N/A\n", 12)])
+    def test_get_frame_count_prefers_ffprobe(self, temp_dir, sample_video, monkeypatch,
+                                             ffprobe_output, expected):
+        """Test that ffprobe's header count is used, falling back to OpenCV when unusable."""
+        video_path = temp_dir / "test_video.mp4"
+        sample_video(video_path, frame_count=12)
+        
+        def fake_run(args, **kwargs):
+            assert args[0] == "/usr/bin/ffprobe"
+            return subprocess.CompletedProcess(args, 0, stdout=ffprobe_output)
+        
+        monkeypatch.setattr(video_discovery, '_FRAME_COUNT_CACHE', {})
+        monkeypatch.setattr(video_discovery, '_FFPROBE', "/usr/bin/ffprobe")
+        monkeypatch.setattr(video_discovery.subprocess, 'run', fake_run)
+        
+        assert VideoDiscovery.get_frame_count(video_path) == expected
+    
+    def test_discover_videos_reuses_frame_count_sidecar(self, temp_dir, sample_video, monkeypatch):
+        """Test that frame counts written by one run are reused by the next."""
+        sample_video(temp_dir / "stereo_cam0_sbs_0001.mp4", frame_count=8)
+        sample_video(temp_dir / "stereo_cam1_sbs_0001.mp4", frame_count=9)
+        
+        monkeypatch.setattr(video_discovery, '_FRAME_COUNT_CACHE', {})
+        first = VideoDiscovery.discover_videos(
+            temp_dir, "stereo_cam0_sbs_*.mp4", "stereo_cam1_sbs_*.mp4"
+        )
+        assert (temp_dir / video_discovery.FRAME_COUNT_CACHE_FILENAME).exists()
+        
+        # A fresh process has an empty in-memory cache and must not probe again
+        def failing_capture(*args):
+            raise AssertionError("video was probed despite a cached frame count")
+        
+        monkeypatch.setattr(video_discovery, '_FRAME_COUNT_CACHE', {})
+        monkeypatch.setattr(video_discovery.cv2, 'VideoCapture', failing_capture)
+        second = VideoDiscovery.discover_videos(
+            temp_dir, "stereo_cam0_sbs_*.mp4", "stereo_cam1_sbs_*.mp4"
+        )
+        
+        assert second == first
+        assert second['cam0'][0].frame_count == 8
+        assert second['cam1'][0].frame_count == 9
+    
+    def test_discover_videos_ignores_malformed_sidecar_entries(self, temp_dir, sample_video, monkeypatch):
+        """Test that bad sidecar entries are re-probed and only discovered files are cached."""
+        cam0 = temp_dir / "stereo_cam0_sbs_0001.mp4"
+        cam1 = temp_dir / "stereo_cam1_sbs_0001.mp4"
+        sample_video(cam0, frame_count=8)
+        sample_video(cam1, frame_count=9)
+        cam0_stat = cam0.stat()
+        cam1_stat = cam1.stat()
+        (temp_dir / video_discovery.FRAME_COUNT_CACHE_FILENAME).write_text(json.dumps({
+            cam0.name: [cam0_stat.st_size, cam0_stat.st_mtime_ns, "8"],
+            cam1.name: [cam1_stat.st_size, cam1_stat.st_mtime_ns, True],
+            "deleted_0001.mp4": [1000, 1, 5],
+            "garbage": "not an entry",
+        }))
+        
+        monkeypatch.setattr(video_discovery, '_FRAME_COUNT_CACHE', {})
+        monkeypatch.setattr(video_discovery, '_FFPROBE', None)
+        result = VideoDiscovery.discover_videos(
+            temp_dir, "stereo_cam0_sbs_*.mp4", "stereo_cam1_sbs_*.mp4"
+        )
+        
+        assert result['cam0'][0].frame_count == 8
+        assert result['cam1'][0].frame_count == 9
+        assert {key[0] for key in video_discovery._FRAME_COUNT_CACHE} == {str(cam0), str(cam1)}
+        
+        # The sidecar is rewritten with only the valid, probed entries
+        sidecar = json.loads((temp_dir / video_discovery.FRAME_COUNT_CACHE_FILENAME).read_text())
+        assert sidecar == {
+            cam0.name: [cam0_stat.st_size, cam0_stat.st_mtime_ns, 8],
+            cam1.name: [cam1_stat.st_size, cam1_stat.st_mtime_ns, 9],
+        }
+    
     def test_validate_segment_pairing_with_perfect_pairs(self):
         """Test validation when all segments are perfectly paired."""
         cam0_segments = [
@@ -308,21 +444,40 @@ class TestVideoDiscovery:
 
 # Property-Based Tests
 
+def create_test_video(path: Path, frame_count: int = 10, width: int = 64, height: int = 64):
+    """Create a simple test video with specified frame count."""
+    out = cv2.VideoWriter(str(path), _FOURCC_MP4V, 30.0, (width, height))
+    
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    for i in range(frame_count):
+        frame[:] = (i * 10 % 256, (i * 20) % 256, (i * 30) % 256)
+        out.write(frame)
+    
+    out.release()
+
+
+@pytest.fixture(scope="session")
+def encoded_video(tmp_path_factory):
+    """Return an encoder that writes one test video per frame count per session.
+    
+    The returned callable takes a frame count and returns the path of the
+    cached video; callers copy it rather than modifying it.
+    """
+    cache_dir = tmp_path_factory.mktemp("videos")
+    
+    @functools.lru_cache(maxsize=None)
+    def _make_video(frame_count: int) -> Path:
+        """Encode a test video once per frame count and return its cached path."""
+        path = cache_dir / f'video_{frame_count}.mp4'
+        create_test_video(path, frame_count)
+        return path
+    
+    return _make_video
+
+
 class TestVideoDiscoveryProperties:
     """Property-based tests for VideoDiscovery class using Hypothesis."""
     
-    def create_test_video(self, path: Path, frame_count: int = 10):
-        """Create a simple test video with specified frame count."""
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(str(path), fourcc, 30.0, (640, 480))
-        
-        for i in range(frame_count):
-            frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            frame[:, :] = (i * 10 % 256, (i * 20) % 256, (i * 30) % 256)
-            out.write(frame)
-        
-        out.release()
-    
     @given(
         cam0_segments=st.lists(
             st.integers(min_value=1, max_value=100),
@@ -339,7 +494,8 @@ class TestVideoDiscoveryProperties:
         num_non_matching=st.integers(min_value=0, max_value=5)
     )
     @settings(max_examples=100, deadline=None)
-    def test_property_video_discovery_correctness(self, cam0_segments, cam1_segments, num_non_matching):
+    def test_property_video_discovery_correctness(self, tmp_path_factory, encoded_video, cam0_segments,
+                                                  cam1_segments, num_non_matching):
         """Property 1: Video Discovery Correctness
         
         **Validates: Requirements 1.1, 1.2**
@@ -349,80 +505,77 @@ class TestVideoDiscoveryProperties:
         specified camera patterns, grouped by camera ID, and sorted by segment
         number in ascending order.
         """
-        # Create temporary directory for this test
-        test_dir = Path(tempfile.mkdtemp())
+        # Per-example directory under pytest's base temp; pytest removes it
+        test_dir = tmp_path_factory.mktemp("discovery")
+        
+        # Define patterns
+        cam0_pattern = "stereo_cam0_sbs_*.mp4"
+        cam1_pattern = "stereo_cam1_sbs_*.mp4"
+        
+        # Create matching cam0 video files. Discovery only looks at names
+        # and a positive frame count, so every file is a copy of one small
+        # single-frame video
+        created_cam0_segments = []
+        for seg_num in cam0_segments:
+            filename = f"stereo_cam0_sbs_{seg_num:04d}.mp4"
+            video_path = test_dir / filename
+            shutil.copyfile(encoded_video(1), video_path)
+            created_cam0_segments.append(seg_num)
+        
+        # Create matching cam1 video files
+        created_cam1_segments = []
+        for seg_num in cam1_segments:
+            filename = f"stereo_cam1_sbs_{seg_num:04d}.mp4"
+            video_path = test_dir / filename
+            shutil.copyfile(encoded_video(1), video_path)
+            created_cam1_segments.append(seg_num)
+        
+        # Create non-matching files (should be ignored)
+        for i in range(num_non_matching):
+            # Use simple ASCII names that won't cause OpenCV issues
+            non_matching_path = test_dir / f"other_video_{i}.mp4"
+            shutil.copyfile(encoded_video(1), non_matching_path)
         
-        try:
-            # Define patterns
-            cam0_pattern = "stereo_cam0_sbs_*.mp4"
-            cam1_pattern = "stereo_cam1_sbs_*.mp4"
-            
-            # Create matching cam0 video files
-            created_cam0_segments = []
-            for seg_num in cam0_segments:
-                filename = f"stereo_cam0_sbs_{seg_num:04d}.mp4"
-                video_path = test_dir / filename
-                self.create_test_video(video_path, frame_count=10)
-                created_cam0_segments.append(seg_num)
-            
-            # Create matching cam1 video files
-            created_cam1_segments = []
-            for seg_num in cam1_segments:
-                filename = f"stereo_cam1_sbs_{seg_num:04d}.mp4"
-                video_path = test_dir / filename
-                self.create_test_video(video_path, frame_count=10)
-                created_cam1_segments.append(seg_num)
-            
-            # Create non-matching files (should be ignored)
-            for i in range(num_non_matching):
-                # Use simple ASCII names that won't cause OpenCV issues
-                non_matching_path = test_dir / f"other_video_{i}.mp4"
-                self.create_test_video(non_matching_path, frame_count=5)
-            
-            # Discover videos
-            result = VideoDiscovery.discover_videos(test_dir, cam0_pattern, cam1_pattern)
-            
-            # Property 1: Only matching files are returned
-            assert 'cam0' in result, "Result should contain 'cam0' key"
-            assert 'cam1' in result, "Result should contain 'cam1' key"
-            
-            # Verify correct number of segments discovered
-            assert len(result['cam0']) == len(created_cam0_segments), \
-                f"Expected {len(created_cam0_segments)} cam0 segments, got {len(result['cam0'])}"
-            assert len(result['cam1']) == len(created_cam1_segments), \
-                f"Expected {len(created_cam1_segments)} cam1 segments, got {len(result['cam1'])}"
-            
-            # Property 2: Files are grouped by camera
-            for segment in result['cam0']:
-                assert segment.camera_id == 'cam0', \
-                    f"All cam0 segments should have camera_id='cam0', got '{segment.camera_id}'"
-            
-            for segment in result['cam1']:
-                assert segment.camera_id == 'cam1', \
-                    f"All cam1 segments should have camera_id='cam1', got '{segment.camera_id}'"
-            
-            # Property 3: Files are sorted by segment number in ascending order
-            cam0_segment_numbers = [seg.segment_number for seg in result['cam0']]
-            cam1_segment_numbers = [seg.segment_number for seg in result['cam1']]
-            
-            assert cam0_segment_numbers == sorted(cam0_segment_numbers), \
-                f"cam0 segments should be sorted by segment number, got {cam0_segment_numbers}"
-            assert cam1_segment_numbers == sorted(cam1_segment_numbers), \
-                f"cam1 segments should be sorted by segment number, got {cam1_segment_numbers}"
-            
-            # Property 4: Segment numbers match what we created
-            assert set(cam0_segment_numbers) == set(created_cam0_segments), \
-                f"cam0 segment numbers should match created segments"
-            assert set(cam1_segment_numbers) == set(created_cam1_segments), \
-                f"cam1 segment numbers should match created segments"
-            
-            # Property 5: All discovered segments have valid frame counts
-            for segment in result['cam0'] + result['cam1']:
-                assert segment.frame_count > 0, \
-                    f"Segment {segment.segment_number} should have positive frame count, got {segment.frame_count}"
-                assert segment.file_path.exists(), \
-                    f"Segment file path should exist: {segment.file_path}"
-        
-        finally:
-            # Cleanup
-            shutil.rmtree(test_dir)
+        # Discover videos
+        result = VideoDiscovery.discover_videos(test_dir, cam0_pattern, cam1_pattern)
+        
+        # Property 1: Only matching files are returned
+        assert 'cam0' in result, "Result should contain 'cam0' key"
+        assert 'cam1' in result, "Result should contain 'cam1' key"
+        
+        # Verify correct number of segments discovered
+        assert len(result['cam0']) == len(created_cam0_segments), \
+            f"Expected {len(created_cam0_segments)} cam0 segments, got {len(result['cam0'])}"
+        assert len(result['cam1']) == len(created_cam1_segments), \
+            f"Expected {len(created_cam1_segments)} cam1 segments, got {len(result['cam1'])}"
+        
+        # Property 2: Files are grouped by camera
+        for segment in result['cam0']:
+            assert segment.camera_id == 'cam0', \
+                f"All cam0 segments should have camera_id='cam0', got '{segment.camera_id}'"
+        
+        for segment in result['cam1']:
+            assert segment.camera_id == 'cam1', \
+                f"All cam1 segments should have camera_id='cam1', got '{segment.camera_id}'"
+        
+        # Property 3: Files are sorted by segment number in ascending order
+        cam0_segment_numbers = [seg.segment_number for seg in result['cam0']]
+        cam1_segment_numbers = [seg.segment_number for seg in result['cam1']]
+        
+        assert cam0_segment_numbers == sorted(cam0_segment_numbers), \
+            f"cam0 segments should be sorted by segment number, got {cam0_segment_numbers}"
+        assert cam1_segment_numbers == sorted(cam1_segment_numbers), \
+            f"cam1 segments should be sorted by segment number, got {cam1_segment_numbers}"
+        
+        # Property 4: Segment numbers match what we created
+        assert set(cam0_segment_numbers) == set(created_cam0_segments), \
+            f"cam0 segment numbers should match created segments"
+        assert set(cam1_segment_numbers) == set(created_cam1_segments), \
+            f"cam1 segment numbers should match created segments"
+        
+        # Property 5: All discovered segments have valid frame counts
+        for segment in result['cam0'] + result['cam1']:
+            assert segment.frame_count > 0, \
+                f"Segment {segment.segment_number} should have positive frame count, got {segment.frame_count}"
+            assert segment.file_path.exists(), \
+                f"Segment file path should exist: {segment.file_path}"